@@ -1,6 +1,27 @@
 # config/__init__.py
 
-from .browser_config import get_browser_config
-from .llm_config import get_llm_config, get_default_search_prompt
+import importlib
 
-__all__ = ['get_browser_config', 'get_llm_config', 'get_default_search_prompt']
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562) so that
+# e.g. `from config import get_llm_config` doesn't pull in crawl4ai.
+_LAZY_ATTRS = {
+    'get_browser_config': '.browser_config',
+    'get_llm_config': '.llm_config',
+    'get_default_search_prompt': '.llm_config',
+    'load_env_once': '.env',
+}
+
+__all__ = ['get_browser_config', 'get_llm_config', 'get_default_search_prompt', 'load_env_once']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,6 @@
 # config/browser_config.py
 
 """Browser configuration for web crawling."""
-from crawl4ai import BrowserConfig
 
 def get_browser_config():
     """
@@ -10,6 +9,8 @@ def get_browser_config():
     Returns:
         BrowserConfig: Browser configuration object
     """
+    from crawl4ai import BrowserConfig
+
     return BrowserConfig(
         browser_type="chromium",
         headless=True,  # Set to False to see browser UI during debugging
@@ -1,8 +1,9 @@
 """Database configuration for PostgreSQL with pgvector."""
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from .env import load_env_once
 
-load_dotenv()
+load_env_once()
 
 class DatabaseConfig:
     """Database configuration settings."""
@@ -13,8 +14,14 @@ class DatabaseConfig:
     USER = os.getenv('DB_USER', 'postgres')
     PASSWORD = os.getenv('DB_PASSWORD', 'postgres')
     EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+    # 'torch', or 'onnx' / 'onnx-int8' to run on ONNX Runtime (needs
+    # `pip install optimum[onnxruntime]`; falls back to PyTorch)
+    EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch').lower()
+    POOL_MIN_CONN = int(os.getenv('DB_POOL_MIN_CONN', 2))
+    POOL_MAX_CONN = int(os.getenv('DB_POOL_MAX_CONN', 8))
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_connection_string(cls) -> str:
         """
         Get PostgreSQL connection string.
@@ -25,6 +32,7 @@ class DatabaseConfig:
         return f"dbname={cls.NAME} user={cls.USER} password={cls.PASSWORD} host={cls.HOST} port={cls.PORT}"
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_connection_params(cls) -> dict:
         """
         Get connection parameters as dictionary.
@@ -39,3 +47,18 @@ class DatabaseConfig:
             'user': cls.USER,
             'password': cls.PASSWORD
         }
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_pool(cls):
+        """
+        Get the process-wide connection pool, created on first use.
+
+        Returns:
+            psycopg2.pool.ThreadedConnectionPool: Shared connection pool
+        """
+        from psycopg2.pool import ThreadedConnectionPool
+
+        return ThreadedConnectionPool(
+            cls.POOL_MIN_CONN, cls.POOL_MAX_CONN, **cls.get_connection_params()
+        )
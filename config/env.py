@@ -0,0 +1,19 @@
+# config/env.py
+
+"""Load .env settings into the process environment once."""
+
+_DOTENV_LOADED = False
+
+
+def load_env_once():
+    """
+    Load the .env file the first time this is called.
+
+    Later calls are no-ops, so entry points and config modules can all call
+    it without re-reading and re-parsing the file.
+    """
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _DOTENV_LOADED = True
@@ -2,7 +2,14 @@
 
 """LLM configuration for URL filtering."""
 import os
+from functools import lru_cache
 
+DEFAULT_SEARCH_PROMPT = (
+    "Find URLs related to company policies, privacy policy, terms of service, "
+    "data protection, cookie policy, acceptable use policy, and compliance documents."
+)
+
+@lru_cache(maxsize=1)
 def get_llm_config():
     """Configure the LLM for URL filtering."""
     base_url = os.getenv("OLLAMA_BASE_URL", "http://10.112.30.10:11434")
@@ -13,9 +20,7 @@ def get_llm_config():
         'base_url': base_url
     }
 
+@lru_cache(maxsize=1)
 def get_default_search_prompt():
     """Get the default search prompt for URL filtering."""
-    return os.getenv("SEARCH_PROMPT", (
-        "Find URLs related to company policies, privacy policy, terms of service, "
-        "data protection, cookie policy, acceptable use policy, and compliance documents."
-    ))
\ No newline at end of file
+    return os.getenv("SEARCH_PROMPT", DEFAULT_SEARCH_PROMPT)
\ No newline at end of file
@@ -14,23 +14,41 @@ Usage:
     python main.py <URL> --no-db            # Skip database storage (files only)
     python main.py <URL> --filter-manual    # Use keyword filtering instead of LLM
     python main.py <URL> --filter-llm "custom prompt"  # Use LLM with custom prompt
+    python main.py <URL> --concurrency 20   # Extract up to 20 pages in parallel
 """
 
 import sys
 import os
 import argparse
 import asyncio
+import itertools
+import logging
+import logging.handlers
+import queue
 import time
-from datetime import datetime
-from dotenv import load_dotenv
-from scrapers import SitemapParser, URLFilter, ContentExtractor
-from utils import FileHandler, URLUtils, DatabaseHandler
+from collections import Counter
+from contextlib import AsyncExitStack
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import urlparse
+from config import load_env_once
 
-load_dotenv()
+load_env_once()
+
+logger = logging.getLogger("scraper")
+
+# Max items buffered between pipeline stages
+PIPELINE_QUEUE_SIZE = 100
 
 
 class PolicyScraper:
     """Main scraper orchestrator."""
+
+    # --format value -> FileHandler method for single-format output
+    _SAVERS = {
+        'json': 'save_json',
+        'text': 'save_text',
+        'markdown': 'save_markdown',
+    }
     
     def __init__(self, args):
         """
@@ -39,6 +57,11 @@ class PolicyScraper:
         Args:
             args: Parsed command line arguments
         """
+        # Scraper/DB modules pull in crawl4ai, psycopg2 and sentence-transformers,
+        # so they're imported here rather than at module load (keeps --help fast)
+        from scrapers import URLFilter, ContentExtractor, SitemapCache
+        from utils import FileHandler
+
         self.args = args
         
         # Check if filter_manual was used
@@ -50,62 +73,225 @@ class PolicyScraper:
             custom_prompt=args.filter_llm if isinstance(args.filter_llm, str) else None,
             manual_keywords=args.filter_manual if (is_manual and len(args.filter_manual) > 0) else None
         )
-        self.content_extractor = ContentExtractor()
+        self.content_extractor = ContentExtractor(use_cache=args.crawl_cache)
         self.file_handler = FileHandler()
-        self.db_handler = DatabaseHandler() if args.use_database else None
+        self.sitemap_cache = SitemapCache(ttl=args.sitemap_ttl) if args.sitemap_ttl > 0 else None
+        self.db_handler = None
+        if args.use_database:
+            from utils import DatabaseHandler
+            self.db_handler = DatabaseHandler()
+
+        # Shared HTTP session and browser, opened by __aenter__
+        self._exit_stack = None
+        self._session = None
+
+    async def __aenter__(self) -> "PolicyScraper":
+        """Open one HTTP session and one browser for every site scraped."""
+        from scrapers import SitemapParser
+
+        self._exit_stack = AsyncExitStack()
+        self._session = await self._exit_stack.enter_async_context(SitemapParser.create_session())
+        await self._exit_stack.enter_async_context(self.content_extractor)
+        self._exit_stack.push_async_callback(self.url_filter.aclose)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._exit_stack.aclose()
+        self._exit_stack = None
+        self._session = None
     
-    async def scrape(self, url: str) -> None:
-        scrape_start_time = time.time()
-        domain_name = URLUtils.get_domain_name(url)
-        
-        print("\n" + "=" * 80)
-        print(f"🕷️  Starting scrape for: {url}")
-        print("=" * 80)
+    async def _get_sitemap_urls(self, url: str, cached=None) -> List[str]:
+        """
+        Get sitemap URLs, served from the on-disk cache while it is fresh.
+
+        A stale entry is revalidated with conditional requests, and used
+        as is when a fresh fetch yields nothing.
+
+        Args:
+            url: Website URL
+            cached: The site's SitemapCache entry, if any
+
+        Returns:
+            List of URLs from the sitemap
+        """
+        from scrapers import SitemapParser
+
+        if cached and not self.sitemap_cache.is_stale(cached):
+            logger.info("🗂️  Using cached sitemap (%s URLs)", len(cached.urls))
+            return cached.urls
 
-        # PHASE 1: URL Discovery
-        sitemap_parser = SitemapParser(url)
+        sitemap_parser = SitemapParser(
+            url, session=self._session, validators=cached.validators if cached else None
+        )
         all_urls = await sitemap_parser.get_all_urls()
+        if all_urls:
+            if self.sitemap_cache:
+                self.sitemap_cache.set(url, all_urls, sitemap_parser.validators)
+        elif cached:
+            logger.warning("⚠️  Sitemap fetch failed, using stale cache (%s URLs)", len(cached.urls))
+            return cached.urls
+        return all_urls
+
+    async def _discover(self, url: str, disc_q: asyncio.Queue) -> Tuple[int, int]:
+        """
+        Pipeline stage 1: find candidate links and queue the relevant ones.
+
+        Unless the sitemap cache is fresh, the homepage is crawled while the
+        sitemap is being fetched, so the homepage fallback doesn't add its
+        latency after a sitemap miss; the crawl is cancelled once the
+        sitemap turns out to be usable. Relevant
+        URLs are queued batch by batch as the filter produces them, so
+        extraction starts before filtering has finished.
+
+        Args:
+            url: Website URL
+            disc_q: Queue feeding the extraction workers
+
+        Returns:
+            Tuple of (URLs discovered, relevant URLs queued)
+        """
+        cached = self.sitemap_cache.get(url) if self.sitemap_cache else None
+        homepage_task = None
+        if not cached or self.sitemap_cache.is_stale(cached):
+            homepage_task = asyncio.create_task(
+                self.url_filter.get_homepage_links(url, self.content_extractor.crawler)
+            )
+            # An unused crawl's error is irrelevant; retrieve it so it isn't logged
+            homepage_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        try:
+            all_urls = await self._get_sitemap_urls(url, cached)
+            
+            source_name = "Sitemap"
+            sitemap_count = len(all_urls)
+            too_large = sitemap_count > self.args.max_sitemap
+            if sitemap_count == 0 or too_large:
+                if too_large:
+                    logger.warning("⚠️  Sitemap too large (%s URLs). Max limit is %s.", sitemap_count, self.args.max_sitemap)
+                logger.info("🌐 Falling back to Homepage link extraction...")
+                if homepage_task is None:
+                    all_urls = await self.url_filter.get_homepage_links(
+                        url, self.content_extractor.crawler
+                    )
+                else:
+                    all_urls = await homepage_task
+                source_name = "Homepage"
+        finally:
+            if homepage_task is not None:
+                homepage_task.cancel()
+
+        logger.info("📋 Found %s potential links from %s", len(all_urls), source_name)
         
-        source_name = "Sitemap"
-        if not all_urls or len(all_urls) > self.args.max_sitemap:
-            if all_urls and len(all_urls) > self.args.max_sitemap:
-                print(f"⚠️  Sitemap too large ({len(all_urls)} URLs). Max limit is {self.args.max_sitemap}.")
-            print("🌐 Falling back to Homepage link extraction...")
-            all_urls = await self.url_filter.get_homepage_links(url)
-            source_name = "Homepage"
-
-        print(f"📋 Found {len(all_urls)} potential links from {source_name}")
-        
-        relevant_urls = await self.url_filter.filter_urls(all_urls)
-        print(f"✨ {len(relevant_urls)} relevant URLs identified")
+        relevant_count = 0
+        async for relevant_urls in self.url_filter.iter_filter_urls(all_urls):
+            for target_url in relevant_urls:
+                await disc_q.put(target_url)
+            relevant_count += len(relevant_urls)
+        logger.info("✨ %s relevant URLs identified", relevant_count)
 
-        # PHASE 2: Content Extraction
-        scraped_data = []
-        for idx, target_url in enumerate(relevant_urls, 1):
-            print(f"📥 [{idx}/{len(relevant_urls)}] Extracting: {target_url}")
-            content = await self.content_extractor.extract(target_url)
+        return len(all_urls), relevant_count
+
+    async def _extract_worker(self, disc_q: asyncio.Queue, save_q: asyncio.Queue, counter: Iterator[int]) -> None:
+        """
+        Pipeline stage 2: extract queued URLs until a None sentinel arrives.
+
+        Args:
+            disc_q: Queue of URLs to extract
+            save_q: Queue receiving extracted page dictionaries
+            counter: Shared counter used to number progress lines
+        """
+        while (target_url := await disc_q.get()) is not None:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("📥 [%s] Extracting: %s", next(counter), target_url)
+            try:
+                content = await self.content_extractor.extract(target_url)
+            except Exception as e:
+                # A dead worker would stall the producer on a full queue
+                logger.warning("     ❌ Extraction failed for %s: %s", target_url, e)
+                continue
             if content:
-                scraped_data.append(content)
+                await save_q.put(content)
+
+    async def _collect(self, save_q: asyncio.Queue) -> List[Dict]:
+        """
+        Pipeline stage 3: gather extracted pages until a None sentinel arrives.
+
+        Args:
+            save_q: Queue of extracted page dictionaries
+
+        Returns:
+            List of extracted page dictionaries, in completion order
+        """
+        scraped_data = []
+        while (content := await save_q.get()) is not None:
+            scraped_data.append(content)
+        return scraped_data
+
+    async def scrape(self, url: str) -> None:
+        from utils import URLUtils
+
+        # Drop stray whitespace, the fragment and a trailing slash before the
+        # URL is used for fetching, cache keys and output names
+        url = URLUtils.normalize_url(url)
+        try:
+            parsed_url = urlparse(url)
+        except ValueError:
+            # e.g. an unterminated IPv6 host such as http://[bad
+            parsed_url = None
+        if parsed_url is None or not URLUtils.is_valid_url(url, parsed_url):
+            logger.warning("❌ Invalid URL, skipping: %s", url)
+            return
+
+        scrape_start_time = time.time()
+        domain_name = URLUtils.get_domain_name(url, parsed_url)
+        
+        logger.info("\n" + "=" * 80)
+        logger.info("🕷️  Starting scrape for: %s", url)
+        logger.info("=" * 80)
+
+        # PHASES 1 + 2: discovery/filtering feeds --concurrency extraction
+        # workers through bounded queues, so the stages overlap
+        disc_q = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        save_q = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        counter = itertools.count(1)
+
+        producer = asyncio.create_task(self._discover(url, disc_q))
+        workers = [
+            asyncio.create_task(self._extract_worker(disc_q, save_q, counter))
+            for _ in range(self.args.concurrency)
+        ]
+        collector = asyncio.create_task(self._collect(save_q))
+        try:
+            urls_discovered, relevant_count = await producer
+            for _ in workers:
+                await disc_q.put(None)
+            await asyncio.gather(*workers)
+            await save_q.put(None)
+            scraped_data = await collector
+        except BaseException:
+            for task in (producer, *workers, collector):
+                task.cancel()
+            raise
+
+        if relevant_count == 0:
+            logger.warning("\n❌ No relevant URLs found")
+            return
         
         if not scraped_data:
-            print("\n❌ No content extracted")
+            logger.warning("\n❌ No content extracted")
             return
         
         # Calculate statistics
-        page_types = {}
-        for item in scraped_data:
-            ptype = item.get('page_type', 'Unknown')
-            page_types[ptype] = page_types.get(ptype, 0) + 1
-        
+        page_types = Counter(item.get('page_type', 'Unknown') for item in scraped_data)
         total_words = sum(item.get('word_count', 0) for item in scraped_data)
-        scrape_elapsed = time.time() - scrape_start_time
+        scrape_end_time = time.time()
+        scrape_elapsed = scrape_end_time - scrape_start_time
         
         # Prepare statistics dictionary
         stats = {
             'website': url,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'urls_discovered': len(all_urls),
-            'relevant_urls': len(relevant_urls),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scrape_end_time)),
+            'urls_discovered': urls_discovered,
+            'relevant_urls': relevant_count,
             'pages_scraped': len(scraped_data),
             'total_words': total_words,
             'page_types': page_types,
@@ -113,65 +299,96 @@ class PolicyScraper:
         }
         
         # PHASE 3: Save results
-        print("\n💾 PHASE 3: Saving Results")
-        print("-" * 80)
+        logger.info("\n💾 PHASE 3: Saving Results")
+        logger.info("-" * 80)
 
         # Save to database if enabled
         if self.args.use_database and self.db_handler:
-            print("\n📊 Saving to PostgreSQL database...")
-            db_success = self.db_handler.save_all(scraped_data, url, domain_name, stats)
+            logger.info("\n📊 Saving to PostgreSQL database...")
+            db_success = self.db_handler.save_all(
+                scraped_data, url, domain_name, stats, batch_size=self.args.db_batch_size
+            )
             if db_success:
-                print("✅ Successfully saved to database with vector embeddings")
+                logger.info("✅ Successfully saved to database with vector embeddings")
             else:
-                print("⚠️  Database save failed, data will only be saved to files")
+                logger.warning("⚠️  Database save failed, data will only be saved to files")
 
         # Save to files (always save as backup or if database disabled)
-        print("\n📁 Saving to files...")
+        logger.info("\n📁 Saving to files...")
         output_format = self.args.format
         
         if output_format == 'all':
             files = self.file_handler.save_all_formats(scraped_data, domain_name, stats)
-            print(f"✅ Saved to folder: scraped_data/{domain_name}/")
-            print("\n📄 Files created:")
+            logger.info("✅ Saved to folder: scraped_data/%s/", domain_name)
+            logger.info("\n📄 Files created:")
             for format_name, filepath in files.items():
                 filename = os.path.basename(filepath)
-                print(f"   - {filename}")
-        elif output_format == 'json':
-            filepath = self.file_handler.save_json(scraped_data, domain_name)
-            summary_path = self.file_handler.save_summary(domain_name, stats)
-            print(f"✅ Saved to folder: scraped_data/{domain_name}/")
-            print(f"   - {os.path.basename(filepath)}")
-            print(f"   - {os.path.basename(summary_path)}")
-        elif output_format == 'text':
-            filepath = self.file_handler.save_text(scraped_data, domain_name)
+                logger.info("   - %s", filename)
+        else:
+            save = getattr(self.file_handler, self._SAVERS[output_format])
+            filepath = save(scraped_data, domain_name)
             summary_path = self.file_handler.save_summary(domain_name, stats)
-            print(f"✅ Saved to folder: scraped_data/{domain_name}/")
-            print(f"   - {os.path.basename(filepath)}")
-            print(f"   - {os.path.basename(summary_path)}")
-        elif output_format == 'markdown':
-            filepath = self.file_handler.save_markdown(scraped_data, domain_name)
-            summary_path = self.file_handler.save_summary(domain_name, stats)
-            print(f"✅ Saved to folder: scraped_data/{domain_name}/")
-            print(f"   - {os.path.basename(filepath)}")
-            print(f"   - {os.path.basename(summary_path)}")
+            logger.info("✅ Saved to folder: scraped_data/%s/", domain_name)
+            logger.info("   - %s", os.path.basename(filepath))
+            logger.info("   - %s", os.path.basename(summary_path))
         
         # Print summary
-        print("\n" + "=" * 80)
-        print("📊 SCRAPING SUMMARY")
-        print("=" * 80)
-        print(f"URLs Discovered: {stats['urls_discovered']}")
-        print(f"Relevant URLs: {stats['relevant_urls']}")
-        print(f"Pages Scraped: {stats['pages_scraped']}")
-        print(f"Total Words: {stats['total_words']:,}")
-        print("\nPage Types:")
+        logger.info("\n" + "=" * 80)
+        logger.info("📊 SCRAPING SUMMARY")
+        logger.info("=" * 80)
+        logger.info("URLs Discovered: %s", stats['urls_discovered'])
+        logger.info("Relevant URLs: %s", stats['relevant_urls'])
+        logger.info("Pages Scraped: %s", stats['pages_scraped'])
+        logger.info("Total Words: %s", format(stats['total_words'], ','))
+        logger.info("\nPage Types:")
         for ptype, count in sorted(page_types.items()):
-            print(f"  - {ptype}: {count}")
-        print("=" * 80)
-        print(f"⏱️  Total time: {scrape_elapsed:.2f} seconds")
+            logger.info("  - %s: %s", ptype, count)
+        logger.info("=" * 80)
+        logger.info("⏱️  Total time: %.2f seconds", scrape_elapsed)
 
 
-async def main():
-    """Main function."""
+def _urls_from_file(path: str) -> Iterator[str]:
+    """
+    Yield non-empty, stripped lines from a URL list file.
+
+    Args:
+        path: Path to a .txt file with one URL per line
+
+    Yields:
+        str: Each URL in file order
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            url = line.strip()
+            if url:
+                yield url
+
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Route scraper, scrapers.* and utils.* logging through a queue drained by
+    a background thread.
+
+    Concurrent extraction tasks only enqueue records, so stdout writes (and
+    the stdout lock) stay off the event loop. Every module logs instead of
+    printing, so one listener writes all output in order.
+
+    Returns:
+        QueueListener: Started listener; call ``stop()`` to flush and detach
+    """
+    from utils import console_handler, log_to_console
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, console_handler())
+    log_to_console(
+        "scraper", "scrapers", "utils", handler=logging.handlers.QueueHandler(log_queue)
+    )
+    listener.start()
+    return listener
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
     parser = argparse.ArgumentParser(
         description="Policy Scraper - Intelligent & Scalable",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -190,6 +407,15 @@ async def main():
     filter_group.add_argument("--filter-manual", nargs='*', 
                               help="Skip LLM, use keyword filtering. Optional: pass specific keywords to use.")
     
+    parser.add_argument("--sitemap-ttl", type=int, default=86400,
+                        help="Seconds to reuse a cached sitemap; 0 disables the cache (default: 86400)")
+    
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="Max pages extracted in parallel (default: 10)")
+    
+    parser.add_argument("--crawl-cache", action='store_true',
+                        help="Reuse pages from crawl4ai's local cache instead of always re-fetching")
+    
     # Output options
     parser.add_argument("--format", choices=['json', 'text', 'markdown', 'all'], default='all',
                         help="Output file format (default: all)")
@@ -197,25 +423,37 @@ async def main():
     # Database options
     parser.add_argument("--no-db", dest='use_database', action='store_false',
                         help="Skip database storage (files only)")
+    parser.add_argument("--db-batch-size", type=int, default=100,
+                        help="Pages copied per database batch (default: 100)")
     parser.set_defaults(use_database=True)
 
-    args = parser.parse_args()
-    
-    if not args.use_database:
-        print("ℹ️  Database storage disabled (--no-db flag)")
+    return parser
 
-    scraper = PolicyScraper(args)
-    
-    if args.target.endswith('.txt'):
-        if not os.path.exists(args.target):
-            print(f"❌ File not found: {args.target}")
+
+_PARSER = _build_parser()
+
+
+async def main():
+    """Main function."""
+    args = _PARSER.parse_args()
+    listener = _start_log_listener()
+
+    try:
+        if not args.use_database:
+            logger.info("ℹ️  Database storage disabled (--no-db flag)")
+
+        if args.target.endswith('.txt') and not os.path.exists(args.target):
+            logger.error("❌ File not found: %s", args.target)
             return
-        with open(args.target, 'r') as f:
-            urls = [line.strip() for line in f if line.strip()]
-        for url in urls:
-            await scraper.scrape(url)
-    else:
-        await scraper.scrape(args.target)
+
+        async with PolicyScraper(args) as scraper:
+            if args.target.endswith('.txt'):
+                for url in _urls_from_file(args.target):
+                    await scraper.scrape(url)
+            else:
+                await scraper.scrape(args.target)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
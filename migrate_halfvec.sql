@@ -0,0 +1,49 @@
+-- Migrate an existing database to halfvec embeddings without dropping data
+-- (schema.sql recreates every table). Needs pgvector 0.7.0+.
+-- Run with: python setup_database.py --migrate
+
+-- The old IVFFlat index (unnamed in earlier schemas) uses vector_cosine_ops
+-- and can't be carried over to the new column type
+DROP INDEX IF EXISTS scraped_pages_content_embedding_idx;
+DROP INDEX IF EXISTS idx_scraped_pages_content_embedding;
+
+ALTER TABLE scraped_pages
+    ALTER COLUMN content_embedding TYPE halfvec(384)
+    USING content_embedding::halfvec(384);
+
+CREATE INDEX idx_scraped_pages_content_embedding ON scraped_pages USING hnsw (content_embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128);
+
+-- Replace the vector(384) overload instead of adding a second one
+DROP FUNCTION IF EXISTS search_similar_content(vector, FLOAT, INT);
+
+-- Create a function to search similar content
+CREATE OR REPLACE FUNCTION search_similar_content(
+    query_embedding halfvec(384),
+    match_threshold FLOAT DEFAULT 0.5,
+    match_count INT DEFAULT 10
+)
+RETURNS TABLE (
+    id INTEGER,
+    url TEXT,
+    title TEXT,
+    page_type VARCHAR(100),
+    content TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        scraped_pages.id,
+        scraped_pages.url,
+        scraped_pages.title,
+        scraped_pages.page_type,
+        scraped_pages.content,
+        1 - (scraped_pages.content_embedding <=> query_embedding) AS similarity
+    FROM scraped_pages
+    WHERE 1 - (scraped_pages.content_embedding <=> query_embedding) > match_threshold
+    ORDER BY scraped_pages.content_embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
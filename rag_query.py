@@ -3,11 +3,15 @@
 RAG (Retrieval-Augmented Generation) Query System using LangChain
 """
 
+import io
 import sys
+import json
+import queue
 import argparse
-import os
-from typing import List
-from dotenv import load_dotenv
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
@@ -15,11 +19,17 @@ from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_ollama import OllamaLLM
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 
-from utils import DatabaseHandler
+from config import get_llm_config, load_env_once
+from utils import AnswerCache, DatabaseHandler, QueryCache, log_to_console
 
-load_dotenv()
+load_env_once()
+
+# Tokens of each document's content included in the prompt context
+DOC_CONTEXT_TOKENS = 400
+# Character cap used instead when no tokenizer is available
+DOC_CONTEXT_CHARS = 1500
 
 
 class PgVectorRetriever(BaseRetriever):
@@ -27,23 +37,126 @@ class PgVectorRetriever(BaseRetriever):
 
     threshold: float = 0.5
     k: int = 5
+    # Search an in-memory copy of the embeddings; worth its one-off load
+    # only in long-lived sessions
+    in_memory: bool = False
 
     class Config:
         arbitrary_types_allowed = True
 
-    def __init__(self, threshold: float = 0.5, k: int = 5):
+    def __init__(self, threshold: float = 0.5, k: int = 5, in_memory: bool = False):
         """Initialize retriever with database handler."""
-        super().__init__(threshold=threshold, k=k)
+        super().__init__(threshold=threshold, k=k, in_memory=in_memory)
         self._db_handler = DatabaseHandler()
+        # (query, k, unfiltered results) of the most recent search
+        self._last_search = None
+        # (query, embedding) of the most recently embedded query
+        self._last_embedding = None
+        # query -> embedding being computed in the background
+        self._prefetched: Dict[str, Future] = {}
+        self._prefetch_lock = threading.Lock()
+
+    def prefetch(self, query: str, executor: Executor):
+        """
+        Start embedding a query in the background so embed() can reuse it.
+
+        Args:
+            query: Query text
+            executor: Executor that runs the embedding
+        """
+        last = self._last_embedding
+        if last is not None and last[0] == query:
+            return
+        with self._prefetch_lock:
+            if query not in self._prefetched:
+                self._prefetched[query] = executor.submit(self._db_handler.embed, query)
+
+    def embed(self, query: str):
+        """
+        Embed a query, reusing the previous or a prefetched embedding.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Embedding as a unit-length array, or None if unavailable
+        """
+        # Always take the query's prefetch, even when it isn't needed, so a
+        # repeated question doesn't leave its future behind
+        with self._prefetch_lock:
+            future = self._prefetched.pop(query, None)
+        if self._last_embedding is None or self._last_embedding[0] != query:
+            embedding = future.result() if future else self._db_handler.embed(query)
+            self._last_embedding = (query, embedding)
+        elif future:
+            future.cancel()
+        return self._last_embedding[1]
+
+    def _search_top_k(self, query: str) -> List[Dict]:
+        """
+        Get the top-k matches for a query with no similarity threshold.
+
+        Thresholds are applied by the caller, so one search (and one query
+        embedding) serves any threshold. Results come from this retriever's
+        last search, the process-wide query cache, or pgvector, in that order.
+
+        Args:
+            query: Query text
+
+        Returns:
+            List of matching pages with similarity scores
+        """
+        if self._last_search and self._last_search[0] == query and self.k <= self._last_search[1]:
+            return self._last_search[2][:self.k]
+
+        cache = QueryCache()
+        key = QueryCache.make_key(query, 0.0, self.k)
+        results = cache.get_exact(key)
+        if results is None:
+            query_embedding = self.embed(query)
+            results = cache.get_semantic(query_embedding, 0.0, self.k)
+            if results is None:
+                results = self._db_handler.search_similar(
+                    query, 0.0, self.k, query_embedding=query_embedding,
+                    in_memory=self.in_memory
+                )
+                cache.put(key, query_embedding, results)
+
+        self._last_search = (query, self.k, results)
+        return results
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun = None
     ) -> List[Document]:
-        """Retrieve documents from pgvector database."""
-        results = self._db_handler.search_similar(query, self.threshold, self.k)
+        """Retrieve documents from pgvector database above the similarity threshold."""
+        return self.retrieve(query)
+
+    def retrieve(self, query: str) -> List[Document]:
+        """
+        Retrieve documents above the similarity threshold.
+
+        Unlike ``invoke``, this skips BaseRetriever's input validation,
+        callback manager and tracing setup, so the hot query path should
+        call it directly.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Matching documents, best first
+        """
+        results = [
+            result for result in self._search_top_k(query)
+            if result['similarity'] > self.threshold
+        ]
 
         documents = []
         for result in results:
+            # Rows are reused through the query caches, so memoize the prompt
+            # excerpt on the row rather than on the per-call Document
+            context_text = result.get('context_text')
+            if context_text is None:
+                context_text = result['context_text'] = _truncate_context(result['content'])
             # Create LangChain Document with metadata
             doc = Document(
                 page_content=result['content'],
@@ -51,7 +164,9 @@ class PgVectorRetriever(BaseRetriever):
                     'title': result['title'],
                     'url': result['url'],
                     'page_type': result['page_type'],
-                    'similarity': result['similarity']
+                    'similarity': result['similarity'],
+                    'similarity_pct': f"{result['similarity']:.2%}",
+                    'context_text': context_text
                 }
             )
             documents.append(doc)
@@ -59,32 +174,7 @@ class PgVectorRetriever(BaseRetriever):
         return documents
 
 
-def create_rag_chain(threshold: float = 0.5, k: int = 5):
-    """
-    Create a RAG chain using LangChain.
-
-    Args:
-        threshold: Minimum similarity threshold for retrieval
-        k: Number of documents to retrieve
-
-    Returns:
-        LangChain RAG chain
-    """
-    # Initialize retriever
-    retriever = PgVectorRetriever(threshold=threshold, k=k)
-
-    # Initialize Ollama LLM
-    ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://10.112.30.10:11434")
-    ollama_model = os.getenv("OLLAMA_MODEL", "ollama/phi4-mini-reasoning").replace("ollama/", "")
-
-    llm = OllamaLLM(
-        base_url=ollama_base_url,
-        model=ollama_model,
-        temperature=0.7,
-    )
-
-    # Create prompt template
-    template = """You are a helpful assistant that answers questions based on company policy documents.
+PROMPT_TEMPLATE = """You are a helpful assistant that answers questions based on company policy documents.
 
 Use the following context from policy documents to answer the question.
 
@@ -102,33 +192,216 @@ Instructions:
 
 Answer:"""
 
-    prompt = ChatPromptTemplate.from_template(template)
-
-    # Format documents for context
-    def format_docs(docs):
-        formatted = []
-        for i, doc in enumerate(docs, 1):
-            formatted.append(
-                f"--- Document {i}: {doc.metadata['title']} ---\n"
-                f"Source: {doc.metadata['url']}\n"
-                f"Type: {doc.metadata['page_type']}\n"
-                f"Similarity: {doc.metadata['similarity']:.2%}\n"
-                f"Content: {doc.page_content[:1500]}\n"
-            )
-        return "\n".join(formatted)
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # optional: not installed, or BPE file not downloadable
+        return None
+
+
+def _truncate_context(content: str) -> str:
+    """
+    Truncate page content to DOC_CONTEXT_TOKENS for the prompt.
+
+    Args:
+        content: Page content
+
+    Returns:
+        Leading part of the content
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return content[:DOC_CONTEXT_CHARS]
+    # Tokens are rarely over 16 characters, so this prefix is enough
+    prefix = content[:DOC_CONTEXT_TOKENS * 16]
+    tokens = encoding.encode(prefix, disallowed_special=())
+    return encoding.decode(tokens[:DOC_CONTEXT_TOKENS])
+
+
+def _context_text(doc: Document) -> str:
+    """
+    Get the prompt excerpt of a document, truncated to DOC_CONTEXT_TOKENS.
+
+    Documents from PgVectorRetriever carry the excerpt memoized on their
+    search result row; others are truncated here.
+
+    Args:
+        doc: Retrieved document
+
+    Returns:
+        Leading part of the document content
+    """
+    text = doc.metadata.get('context_text')
+    if text is None:
+        text = _truncate_context(doc.page_content)
+    return text
+
+
+def format_docs(docs: List[Document]) -> str:
+    """
+    Format retrieved documents into the prompt context.
+
+    Args:
+        docs: Retrieved documents
+
+    Returns:
+        Context string for the prompt
+    """
+    buf = io.StringIO()
+    for i, doc in enumerate(docs, 1):
+        if i > 1:
+            buf.write("\n")
+        buf.write(
+            f"--- Document {i}: {doc.metadata['title']} ---\n"
+            f"Source: {doc.metadata['url']}\n"
+            f"Type: {doc.metadata['page_type']}\n"
+            f"Similarity: {doc.metadata['similarity_pct']}\n"
+            f"Content: {_context_text(doc)}\n"
+        )
+    return buf.getvalue()
+
+
+GRADE_PROMPT_TEMPLATE = """You are grading whether retrieved policy documents are relevant to a question.
+
+Question: {question}
+
+Documents (JSON list of {{"idx": ..., "preview": ...}}):
+{documents}
+
+Reply with ONLY a JSON list of the idx values of the documents that help answer the question, e.g. [0, 2]. Reply [] if none do."""
+
+
+def create_llm(temperature: float = 0.7) -> OllamaLLM:
+    """
+    Create the Ollama LLM configured for this project.
+
+    Args:
+        temperature: Sampling temperature
+
+    Returns:
+        OllamaLLM instance
+    """
+    llm_config = get_llm_config()
+    return OllamaLLM(
+        base_url=llm_config['base_url'],
+        model=llm_config['provider'].replace("ollama/", ""),
+        temperature=temperature,
+    )
+
+
+def create_answer_chain():
+    """
+    Create the generation half of the RAG chain (prompt | LLM | parser).
+
+    Invoke it with ``{"context": ..., "question": ...}`` when documents
+    have already been retrieved.
+
+    Returns:
+        LangChain answer chain
+    """
+    prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+
+    return prompt | create_llm(temperature=0.7) | StrOutputParser()
+
+
+def grade_docs(question: str, docs: List[Document]) -> List[int]:
+    """
+    Ask the LLM, in a single call, which retrieved documents are relevant.
+
+    Args:
+        question: The question being answered
+        docs: Retrieved documents
+
+    Returns:
+        Indices into ``docs`` of the relevant documents, in retrieval order;
+        every index if the grader's reply can't be parsed
+    """
+    previews = json.dumps(
+        [{"idx": idx, "preview": doc.page_content[:400]} for idx, doc in enumerate(docs)],
+        ensure_ascii=False
+    )
+    reply = create_llm(temperature=0).invoke(
+        GRADE_PROMPT_TEMPLATE.format(question=question, documents=previews)
+    )
+
+    try:
+        selected = json.loads(reply[reply.index('['):reply.rindex(']') + 1])
+        return sorted({int(idx) for idx in selected if 0 <= int(idx) < len(docs)})
+    except (ValueError, TypeError):
+        print(f"Could not parse grader reply, keeping all documents: {reply!r}")
+        return list(range(len(docs)))
+
+
+def create_rag_chain(threshold: float = 0.5, k: int = 5):
+    """
+    Create a RAG chain using LangChain.
+
+    Args:
+        threshold: Minimum similarity threshold for retrieval
+        k: Number of documents to retrieve
+
+    Returns:
+        LangChain RAG chain
+    """
+    # Initialize retriever
+    retriever = PgVectorRetriever(threshold=threshold, k=k)
 
     # Create RAG chain
     rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
+        {
+            "context": RunnableLambda(retriever.retrieve) | format_docs,
+            "question": RunnablePassthrough()
+        }
+        | create_answer_chain()
     )
 
     return rag_chain, retriever
 
 
-def ask_question(question: str, threshold: float = 0.5, limit: int = 5, verbose: bool = False):
+def print_sources(sources: List[Dict]):
+    """
+    Print the sources an answer was generated from.
+
+    Args:
+        sources: Source metadata (title, url, similarity) of the answer
+    """
+    print("\n" + "=" * 80)
+    print("SOURCES")
+    print("=" * 80)
+    for idx, source in enumerate(sources, 1):
+        print(f"{idx}. {source['title']} (Similarity: {source['similarity']:.2%})")
+        print(f"   {source['url']}")
+    print("=" * 80)
+
+
+def print_answer(answer: str, sources: List[Dict]):
+    """
+    Print an answer followed by its sources.
+
+    Args:
+        answer: Generated answer
+        sources: Source metadata (title, url, similarity) of the answer
+    """
+    print("=" * 80)
+    print("ANSWER")
+    print("=" * 80)
+    print(answer)
+    print_sources(sources)
+
+
+def ask_question(
+    question: str,
+    threshold: float = 0.5,
+    limit: int = 5,
+    verbose: bool = False,
+    use_cache: bool = True,
+    rerank: bool = False,
+    retriever: Optional[PgVectorRetriever] = None
+):
     """
     Ask a question and get an AI-generated answer using RAG.
 
@@ -137,6 +410,10 @@ def ask_question(question: str, threshold: float = 0.5, limit: int = 5, verbose:
         threshold: Minimum similarity score for retrieval (0-1)
         limit: Maximum number of documents to retrieve
         verbose: Show retrieved documents and sources
+        use_cache: Reuse the answer to a near-duplicate earlier question
+        rerank: Have the LLM drop irrelevant documents before answering
+        retriever: Retriever to reuse across questions (built with the
+            same threshold and limit); a new one is created if omitted
     """
     print("=" * 80)
     print("RAG QUERY SYSTEM (LangChain)")
@@ -148,11 +425,24 @@ def ask_question(question: str, threshold: float = 0.5, limit: int = 5, verbose:
     try:
         # Create RAG chain
         print("Initializing RAG chain...")
-        rag_chain, retriever = create_rag_chain(threshold=threshold, k=limit)
-
-        # Retrieve documents (for verbose mode)
+        if retriever is None:
+            retriever = PgVectorRetriever(threshold=threshold, k=limit)
+
+        if use_cache:
+            # The retriever reuses this embedding if the cache misses
+            question_embedding = retriever.embed(question)
+            cached = AnswerCache().get(question_embedding, threshold, limit)
+            if cached:
+                cached_question, answer, sources = cached
+                print(f"Answered from cache (similar to: {cached_question})\n")
+                print_answer(answer, sources)
+                return
+
+        answer_chain = create_answer_chain()
+
+        # Retrieve documents once; the answer chain reuses them
         print("Retrieving relevant documents...")
-        docs = retriever.invoke(question)
+        docs = retriever.retrieve(question)
 
         if not docs:
             print("No relevant documents found")
@@ -164,10 +454,19 @@ def ask_question(question: str, threshold: float = 0.5, limit: int = 5, verbose:
 
         print(f"Retrieved {len(docs)} relevant documents\n")
 
+        if rerank:
+            print("Grading documents with LLM...")
+            keep = grade_docs(question, docs)
+            if keep:
+                docs = [docs[idx] for idx in keep]
+                print(f"Kept {len(docs)} documents after grading\n")
+            else:
+                print("Grader kept no documents, using all of them\n")
+
         if verbose:
             print("Retrieved Documents:")
             for idx, doc in enumerate(docs, 1):
-                print(f"\n{idx}. {doc.metadata['title']} (Similarity: {doc.metadata['similarity']:.2%})")
+                print(f"\n{idx}. {doc.metadata['title']} (Similarity: {doc.metadata['similarity_pct']})")
                 print(f"   URL: {doc.metadata['url']}")
                 print(f"   Type: {doc.metadata['page_type']}")
                 print(f"   Preview: {doc.page_content[:200]}...")
@@ -175,34 +474,98 @@ def ask_question(question: str, threshold: float = 0.5, limit: int = 5, verbose:
 
         # Generate answer
         print("Generating answer with LLM...\n")
-        answer = rag_chain.invoke(question)
-
-        # Display answer
         print("=" * 80)
         print("ANSWER")
         print("=" * 80)
-        print(answer)
 
-        # Display sources
-        print("\n" + "=" * 80)
-        print("SOURCES")
-        print("=" * 80)
-        for idx, doc in enumerate(docs, 1):
-            print(f"{idx}. {doc.metadata['title']} (Similarity: {doc.metadata['similarity']:.2%})")
-            print(f"   {doc.metadata['url']}")
-        print("=" * 80)
+        # Print tokens as Ollama produces them
+        answer_parts = []
+        for token in answer_chain.stream({"context": format_docs(docs), "question": question}):
+            sys.stdout.write(token)
+            sys.stdout.flush()
+            answer_parts.append(token)
+        print()
+        answer = "".join(answer_parts)
+
+        sources = [
+            {
+                'title': doc.metadata['title'],
+                'url': doc.metadata['url'],
+                'similarity': doc.metadata['similarity'],
+            }
+            for doc in docs
+        ]
+        if use_cache:
+            AnswerCache().put(question, question_embedding, threshold, limit, answer, sources)
+
+        print_sources(sources)
 
     except Exception as e:
         print(f"Error: {e}")
         print("\nTroubleshooting:")
         print("- Make sure PostgreSQL is running and database exists")
         print("- Check Ollama is running at the configured URL")
-        print(f"- Ollama URL: {os.getenv('OLLAMA_BASE_URL', 'http://10.112.30.10:11434')}")
+        print(f"- Ollama URL: {get_llm_config()['base_url']}")
         import traceback
         if verbose:
             traceback.print_exc()
 
 
+def interactive_session(
+    threshold: float = 0.5,
+    limit: int = 5,
+    verbose: bool = False,
+    use_cache: bool = True,
+    rerank: bool = False
+):
+    """
+    Answer questions read from stdin until EOF or "exit".
+
+    Lines are read on a background thread, and each question is embedded
+    as soon as it is entered, so typing the next question while an answer
+    is still streaming overlaps its embedding with generation.
+
+    Args:
+        threshold: Minimum similarity score for retrieval (0-1)
+        limit: Maximum number of documents to retrieve
+        verbose: Show retrieved documents and sources
+        use_cache: Reuse the answer to a near-duplicate earlier question
+        rerank: Have the LLM drop irrelevant documents before answering
+    """
+    retriever = PgVectorRetriever(threshold=threshold, k=limit, in_memory=True)
+    questions: "queue.Queue[Optional[str]]" = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    def read_questions():
+        for line in sys.stdin:
+            question = line.strip()
+            if not question:
+                continue
+            if question.lower() not in ('exit', 'quit'):
+                retriever.prefetch(question, executor)
+            questions.put(question)
+        questions.put(None)
+
+    threading.Thread(target=read_questions, daemon=True).start()
+    print("Ask a question and press Enter (\"exit\" or Ctrl-D to quit).")
+
+    try:
+        while True:
+            print("\n> ", end="", flush=True)
+            question = questions.get()
+            if question is None or question.lower() in ('exit', 'quit'):
+                break
+            ask_question(
+                question, threshold, limit, verbose,
+                use_cache=use_cache, rerank=rerank, retriever=retriever
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(wait=False)
+    print()
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(
@@ -213,12 +576,14 @@ Examples:
   python rag_query.py "How do companies handle GDPR compliance?"
   python rag_query.py "What is the data retention policy?" --threshold 0.6
   python rag_query.py "Do companies share data with third parties?" --limit 3 --verbose
+  python rag_query.py                # interactive session
         """
     )
 
     parser.add_argument(
         'question',
-        help='Your question about the policies'
+        nargs='?',
+        help='Your question about the policies (omit for an interactive session)'
     )
     parser.add_argument(
         '--threshold',
@@ -237,14 +602,32 @@ Examples:
         action='store_true',
         help='Show retrieved documents before answer'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always retrieve and generate, ignoring cached answers'
+    )
+    parser.add_argument(
+        '--rerank',
+        action='store_true',
+        help='Let the LLM drop irrelevant documents (one extra call) before answering'
+    )
 
     args = parser.parse_args()
+    # Database handler progress and errors
+    log_to_console("utils")
 
     if not args.question:
-        parser.print_help()
+        interactive_session(
+            args.threshold, args.limit, args.verbose,
+            use_cache=not args.no_cache, rerank=args.rerank
+        )
         return
 
-    ask_question(args.question, args.threshold, args.limit, args.verbose)
+    ask_question(
+        args.question, args.threshold, args.limit, args.verbose,
+        use_cache=not args.no_cache, rerank=args.rerank
+    )
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 -- Database schema for scraper with pgvector support
 
--- Enable pgvector extension
+-- Enable pgvector extension (0.7.0+ for halfvec)
 CREATE EXTENSION IF NOT EXISTS vector;
 
 -- Drop tables if they exist (for clean setup)
@@ -31,8 +31,9 @@ CREATE TABLE scraped_pages (
     content TEXT NOT NULL,
     word_count INTEGER,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    -- Vector embedding of the content (384 dimensions for all-MiniLM-L6-v2)
-    content_embedding vector(384)
+    -- Vector embedding of the content (384 dimensions for all-MiniLM-L6-v2),
+    -- stored as half precision to halve table and index size
+    content_embedding halfvec(384)
 );
 
 -- Create indexes for better query performance
@@ -42,14 +43,15 @@ CREATE INDEX idx_scraped_pages_page_type ON scraped_pages(page_type);
 CREATE INDEX idx_scrape_sessions_domain ON scrape_sessions(domain_name);
 CREATE INDEX idx_scrape_sessions_scraped_at ON scrape_sessions(scraped_at);
 
--- Create vector similarity search index (IVFFlat index for faster similarity search)
--- This index will be created after data is inserted (requires at least 1000 rows for optimal performance)
--- For now, we'll use the default index
-CREATE INDEX ON scraped_pages USING ivfflat (content_embedding vector_cosine_ops) WITH (lists = 100);
+-- Create vector similarity search index (HNSW, which unlike IVFFlat needs no
+-- training data and can be built on the empty table). m and ef_construction
+-- are raised from the defaults (16, 64) for better recall on large corpora;
+-- queries set hnsw.ef_search (see utils/db_handler.py)
+CREATE INDEX idx_scraped_pages_content_embedding ON scraped_pages USING hnsw (content_embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128);
 
 -- Create a function to search similar content
 CREATE OR REPLACE FUNCTION search_similar_content(
-    query_embedding vector(384),
+    query_embedding halfvec(384),
     match_threshold FLOAT DEFAULT 0.5,
     match_count INT DEFAULT 10
 )
@@ -1,7 +1,8 @@
 # scrapers/__init__.py
 
 from .sitemap_parser import SitemapParser
+from .sitemap_cache import SitemapCache
 from .url_filter import URLFilter
 from .content_extractor import ContentExtractor
 
-__all__ = ['SitemapParser', 'URLFilter', 'ContentExtractor']
\ No newline at end of file
+__all__ = ['SitemapParser', 'SitemapCache', 'URLFilter', 'ContentExtractor']
\ No newline at end of file
@@ -1,17 +1,119 @@
 # scrapers/content_extractor.py
 
 """Content extractor - extracts and cleans text without LLM."""
-from typing import Dict, Optional
-from bs4 import BeautifulSoup
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+from selectolax.lexbor import LexborHTMLParser, LexborNode as LexNode
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 from config import get_browser_config
+from utils.singleton import SingletonMixin
 
-class ContentExtractor:
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to plain substring checks
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# A line break plus any whitespace around it (incl. blank lines)
+_LINE_BREAK_WS = re.compile(r'\s*\n\s*')
+
+# Keywords for each page type, checked in order (first match wins)
+_PAGE_TYPE_PATTERNS = {
+    'Privacy Policy': ['privacy', 'privacy-policy'],
+    'Terms of Service': ['terms', 'tos', 'terms-of-service', 'terms-and-conditions'],
+    'Cookie Policy': ['cookie', 'cookies'],
+    'About Us': ['about', 'about-us'],
+    'Contact': ['contact', 'contact-us'],
+    'FAQ': ['faq', 'frequently-asked'],
+    'Data Protection': ['data-protection', 'gdpr', 'data-privacy'],
+    'Acceptable Use': ['acceptable-use', 'aup'],
+    'Legal': ['legal', 'compliance'],
+}
+_PAGE_TYPES = list(_PAGE_TYPE_PATTERNS)
+
+
+def _build_page_type_automaton():
+    """Build an Aho-Corasick automaton mapping each keyword to its type's priority."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, keywords in enumerate(_PAGE_TYPE_PATTERNS.values()):
+        for keyword in keywords:
+            automaton.add_word(keyword, min(priority, automaton.get(keyword, priority)))
+    automaton.make_automaton()
+    return automaton
+
+
+_PAGE_TYPE_AUTOMATON = _build_page_type_automaton()
+
+# Tags that never hold page content
+_UNWANTED_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe', 'noscript']
+_UNWANTED_TAG_SET = frozenset(_UNWANTED_TAGS)
+# Substrings of class/id names used by navigation, ads and other chrome.
+# "ad" is too short for a substring match ("padding", "header"), so it only
+# matches as a whole class or a leading "ad-" prefix.
+_UNWANTED_CLASS_WORDS = ['nav', 'menu', 'sidebar', 'footer', 'header', 'cookie', 'banner', 'social']
+_UNWANTED_ID_WORDS = ['nav', 'menu', 'sidebar', 'footer', 'header', 'cookie', 'banner']
+
+# Attribute matches are scoped below <body> so a class on <html>/<body>
+# (e.g. "menu-open") can't wipe the whole page.
+_UNWANTED_SELECTOR = ', '.join(
+    _UNWANTED_TAGS
+    + [f'body [class*="{word}" i]' for word in _UNWANTED_CLASS_WORDS]
+    + ['body [class~="ad" i]', 'body [class^="ad-" i]']
+    + [f'body [id*="{word}" i]' for word in _UNWANTED_ID_WORDS]
+)
+
+# Content containers, in order of preference; <body> is the last resort
+_CONTENT_SELECTORS = [
+    'main',
+    'article',
+    'div[class*="content" i]',
+    'div[id*="content" i]',
+]
+_CONTENT_SELECTOR = ', '.join(_CONTENT_SELECTORS)
+
+class ContentExtractor(SingletonMixin):
     """Extract and clean content from web pages using traditional parsing."""
     
-    def __init__(self):
-        """Initialize content extractor."""
-        pass
+    def __init__(self, use_cache: bool = False):
+        """
+        Initialize content extractor.
+
+        Args:
+            use_cache: Let crawl4ai serve pages from its local cache instead
+                of always re-fetching them
+        """
+        if self._initialized:
+            return
+        self.cache_mode = CacheMode.ENABLED if use_cache else CacheMode.BYPASS
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._users = 0
+        self._initialized = True
+
+    @property
+    def crawler(self) -> Optional[AsyncWebCrawler]:
+        """The long-lived crawler while inside ``async with``, else None."""
+        return self._crawler
+
+    async def __aenter__(self) -> "ContentExtractor":
+        """Start one browser shared by every extract() call until exit."""
+        if self._users == 0:
+            crawler = AsyncWebCrawler(config=get_browser_config())
+            await crawler.start()
+            self._crawler = crawler
+        self._users += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._users -= 1
+        if self._users == 0 and self._crawler is not None:
+            crawler, self._crawler = self._crawler, None
+            await crawler.close()
     
     def _clean_text(self, text: str) -> str:
         """
@@ -23,17 +125,15 @@ class ContentExtractor:
         Returns:
             str: Cleaned text
         """
-        # Remove extra whitespace
-        lines = [line.strip() for line in text.split('\n')]
-        lines = [line for line in lines if line]
-        return '\n'.join(lines)
+        # Strip every line and drop blank ones in a single regex pass
+        return _LINE_BREAK_WS.sub('\n', text).strip()
     
-    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+    def _extract_metadata(self, tree: LexborHTMLParser, url: str) -> Dict[str, str]:
         """
         Extract metadata from HTML.
         
         Args:
-            soup: BeautifulSoup object
+            tree: Parsed HTML tree
             url: Page URL
             
         Returns:
@@ -46,71 +146,99 @@ class ContentExtractor:
         }
         
         # Get title
-        title_tag = soup.find('title')
+        title_tag = tree.css_first('title')
         if title_tag:
-            metadata['title'] = title_tag.get_text().strip()
+            metadata['title'] = title_tag.text().strip()
         
         # Get meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            metadata['description'] = meta_desc['content'].strip()
+        meta_desc = tree.css_first('meta[name="description"]')
+        if meta_desc and meta_desc.attributes.get('content'):
+            metadata['description'] = meta_desc.attributes['content'].strip()
         
         return metadata
+
+    @staticmethod
+    def _decompose_all(nodes: List[LexNode]) -> None:
+        """
+        Remove matched nodes from the tree.
+
+        Nodes nested inside another matched node go away with it, and are
+        skipped so that nothing is destroyed twice.
+
+        Args:
+            nodes: Nodes to remove, in document order
+        """
+        matched = {node.mem_id for node in nodes}
+        roots = []
+        for node in nodes:
+            parent = node.parent
+            while parent is not None and parent.mem_id not in matched:
+                parent = parent.parent
+            if parent is None:
+                roots.append(node)
+        for node in roots:
+            node.decompose()
     
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _content_preference(node: LexNode) -> int:
+        """
+        Rank a content container by the first of _CONTENT_SELECTORS it matches.
+
+        Args:
+            node: Node matched by _CONTENT_SELECTOR
+
+        Returns:
+            int: Index into _CONTENT_SELECTORS (lower is preferred)
+        """
+        if node.tag == 'main':
+            return 0
+        if node.tag == 'article':
+            return 1
+        if 'content' in (node.attributes.get('class') or '').lower():
+            return 2
+        return 3
+    
+    def _extract_main_content(self, tree: LexborHTMLParser) -> str:
         """
         Extract main content from HTML, removing navigation, footer, etc.
         
         Args:
-            soup: BeautifulSoup object
+            tree: Parsed HTML tree
             
         Returns:
             str: Main content text
         """
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 
-                         'aside', 'iframe', 'noscript']):
-            tag.decompose()
-        
-        # Remove elements with common class/id names for non-content
-        unwanted_selectors = [
-            {'class': lambda x: x and any(word in ' '.join(x).lower() 
-                                         for word in ['nav', 'menu', 'sidebar', 
-                                                     'footer', 'header', 'cookie',
-                                                     'banner', 'ad', 'social'])},
-            {'id': lambda x: x and any(word in x.lower() 
-                                       for word in ['nav', 'menu', 'sidebar', 
-                                                   'footer', 'header', 'cookie',
-                                                   'banner'])},
-        ]
-        
-        for selector in unwanted_selectors:
-            for element in soup.find_all(**selector):
-                element.decompose()
-        
-        # Try to find main content area
-        main_content = None
-        
-        # Look for common content containers
-        for selector in [
-            soup.find('main'),
-            soup.find('article'),
-            soup.find('div', class_=lambda x: x and 'content' in x.lower()),
-            soup.find('div', id=lambda x: x and 'content' in x.lower()),
-        ]:
-            if selector:
-                main_content = selector
-                break
-        
-        # If no main content found, use body
-        if not main_content:
-            main_content = soup.find('body')
+        # Class/id substrings also match layout wrappers ("has-sidebar",
+        # "content-sidebar-wrap"), so an element matched only by those is
+        # kept when it wraps a content container; chrome tags always go
+        wrappers = set()
+        for node in tree.css(_CONTENT_SELECTOR):
+            parent = node.parent
+            while parent is not None and parent.mem_id not in wrappers:
+                wrappers.add(parent.mem_id)
+                parent = parent.parent
+        
+        # Remove unwanted elements and elements with common class/id names
+        # for non-content, in a single selector pass
+        self._decompose_all([
+            node for node in tree.css(_UNWANTED_SELECTOR)
+            if node.tag in _UNWANTED_TAG_SET or node.mem_id not in wrappers
+        ])
+        
+        # Find every content container in one pass, then take the first one
+        # of the most preferred kind (a selector list alone would pick
+        # whichever comes first in the document)
+        main_content = min(
+            tree.css(_CONTENT_SELECTOR),
+            key=self._content_preference,
+            default=None
+        ) or tree.body
         
         if not main_content:
             return ""
         
         # Extract text
-        text = main_content.get_text(separator='\n', strip=True)
+        text = main_content.text(separator='\n', strip=True)
         return self._clean_text(text)
     
     def _detect_page_type(self, url: str, title: str, content: str) -> str:
@@ -127,63 +255,71 @@ class ContentExtractor:
         """
         url_lower = url.lower()
         title_lower = title.lower()
-        content_lower = content.lower()[:500]  # Check first 500 chars
-        
-        # Define patterns for different page types
-        patterns = {
-            'Privacy Policy': ['privacy', 'privacy-policy'],
-            'Terms of Service': ['terms', 'tos', 'terms-of-service', 'terms-and-conditions'],
-            'Cookie Policy': ['cookie', 'cookies'],
-            'About Us': ['about', 'about-us'],
-            'Contact': ['contact', 'contact-us'],
-            'FAQ': ['faq', 'frequently-asked'],
-            'Data Protection': ['data-protection', 'gdpr', 'data-privacy'],
-            'Acceptable Use': ['acceptable-use', 'aup'],
-            'Legal': ['legal', 'compliance'],
-        }
         
-        for page_type, keywords in patterns.items():
+        if _PAGE_TYPE_AUTOMATON is not None:
+            # One scan per string; the earliest-listed matching type wins
+            best = min(
+                (priority
+                 for text in (url_lower, title_lower)
+                 for _, priority in _PAGE_TYPE_AUTOMATON.iter(text)),
+                default=None
+            )
+            return _PAGE_TYPES[best] if best is not None else 'General'
+        
+        for page_type, keywords in _PAGE_TYPE_PATTERNS.items():
             if any(keyword in url_lower or keyword in title_lower 
                    for keyword in keywords):
                 return page_type
         
         return 'General'
     
-    async def extract(self, url: str) -> Optional[Dict]:
+    @asynccontextmanager
+    async def _crawler_scope(self, crawler: Optional[AsyncWebCrawler]) -> AsyncIterator[AsyncWebCrawler]:
+        """Yield the given or long-lived crawler, or launch a temporary one."""
+        crawler = crawler or self._crawler
+        if crawler is not None:
+            yield crawler
+        else:
+            async with AsyncWebCrawler(config=get_browser_config()) as new_crawler:
+                yield new_crawler
+
+    async def extract(self, url: str, crawler: Optional[AsyncWebCrawler] = None) -> Optional[Dict]:
         """
         Extract content from a URL.
         
         Args:
             url: URL to extract content from
+            crawler: Already-started crawler to reuse; defaults to the
+                extractor's own crawler, or a browser launched for this call
             
         Returns:
             Dict with extracted content or None if failed
         """
-        print(f"   📥 Extracting: {url}")
+        logger.info("   📥 Extracting: %s", url)
         
-        async with AsyncWebCrawler(config=get_browser_config()) as crawler:
+        async with self._crawler_scope(crawler) as crawler:
             result = await crawler.arun(
                 url=url,
                 config=CrawlerRunConfig(
-                    cache_mode=CacheMode.BYPASS,
+                    cache_mode=self.cache_mode,
                 )
             )
             
             if not result.success:
-                print(f"     ❌ Failed to fetch page")
+                logger.error("     ❌ Failed to fetch page")
                 return None
             
             try:
-                soup = BeautifulSoup(result.html, 'lxml')
+                tree = LexborHTMLParser(result.html)
                 
                 # Extract metadata
-                metadata = self._extract_metadata(soup, url)
+                metadata = self._extract_metadata(tree, url)
                 
                 # Extract main content
-                content = self._extract_main_content(soup)
+                content = self._extract_main_content(tree)
                 
                 if not content or len(content) < 50:
-                    print(f"     ⚠️  Content too short or empty")
+                    logger.warning("     ⚠️  Content too short or empty")
                     return None
                 
                 # Detect page type
@@ -202,9 +338,37 @@ class ContentExtractor:
                     'word_count': len(content.split()),
                 }
                 
-                print(f"     ✅ Extracted: {page_type} ({data['word_count']} words)")
+                logger.info("     ✅ Extracted: %s (%s words)", page_type, data['word_count'])
                 return data
                 
             except Exception as e:
-                print(f"     ❌ Extraction error: {e}")
-                return None
\ No newline at end of file
+                logger.error("     ❌ Extraction error: %s", e)
+                return None
+
+    async def extract_many(self, urls: List[str], concurrency: int = 8) -> List[Optional[Dict]]:
+        """
+        Extract content from several URLs concurrently.
+        
+        Args:
+            urls: URLs to extract content from
+            concurrency: Maximum number of pages fetched at once
+            
+        Returns:
+            One result per URL, in input order (None where extraction failed)
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _one(url: str) -> Optional[Dict]:
+            async with sem:
+                return await self.extract(url)
+        
+        async with self:
+            results = await asyncio.gather(*[_one(url) for url in urls], return_exceptions=True)
+        
+        extracted = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error("     ❌ Extraction error for %s: %s", url, result)
+                result = None
+            extracted.append(result)
+        return extracted
@@ -0,0 +1,123 @@
+# scrapers/sitemap_cache.py
+
+"""On-disk cache of sitemap URL lists with stale-while-revalidate semantics."""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+
+class SitemapValidators(NamedTuple):
+    """HTTP validators and parsed contents of one sitemap file."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    kind: str
+    urls: List[str]
+
+
+class CachedSitemap(NamedTuple):
+    """Cached sitemap URLs, when they were fetched, and per-file validators."""
+    urls: List[str]
+    fetched_at: float
+    validators: Dict[str, SitemapValidators]
+
+
+class SitemapCache:
+    """
+    Store discovered sitemap URLs per site as small JSON files.
+
+    Each entry also keeps the ETag/Last-Modified of every sitemap file
+    behind those URLs, so a stale entry can be revalidated with
+    conditional requests: files answered with 304 Not Modified are
+    neither downloaded nor parsed again.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(".cache", "sitemaps"), ttl: float = 86400):
+        """
+        Initialize sitemap cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per site
+            ttl: Seconds before a cached entry is considered stale
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _path(self, site_url: str) -> str:
+        key = hashlib.sha1(site_url.rstrip('/').encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def is_stale(self, entry: CachedSitemap) -> bool:
+        """
+        Check whether a cached entry is older than the TTL.
+
+        Args:
+            entry: Cached sitemap entry
+
+        Returns:
+            bool: True if the entry should be refreshed
+        """
+        return time.time() - entry.fetched_at > self.ttl
+
+    def get(self, site_url: str) -> Optional[CachedSitemap]:
+        """
+        Load the cached URLs for a site, fresh or stale.
+
+        Args:
+            site_url: Website URL the sitemap belongs to
+
+        Returns:
+            CachedSitemap or None if nothing usable is cached
+        """
+        try:
+            with open(self._path(site_url), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            urls = data['urls']
+            validators = {}
+            for sitemap_url, file in data.get('files', {}).items():
+                # A urlset file's URLs are a slice of the site's URL list
+                file_urls = file['urls'] if 'urls' in file else urls[slice(*file['span'])]
+                validators[sitemap_url] = SitemapValidators(
+                    file['etag'], file['last_modified'], file['kind'], file_urls
+                )
+            return CachedSitemap(urls, data['fetched_at'], validators)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(
+        self,
+        site_url: str,
+        urls: List[str],
+        validators: Optional[Dict[str, SitemapValidators]] = None
+    ) -> None:
+        """
+        Store the URLs discovered for a site.
+
+        Args:
+            site_url: Website URL the sitemap belongs to
+            urls: URLs parsed from the sitemap
+            validators: Every sitemap file fetched, in the order its URLs
+                were concatenated into ``urls``
+        """
+        files = {}
+        offset = 0
+        for sitemap_url, file in (validators or {}).items():
+            entry = {'etag': file.etag, 'last_modified': file.last_modified, 'kind': file.kind}
+            if file.kind == 'index':
+                entry['urls'] = file.urls
+            else:
+                # Stored as a span of ``urls`` rather than a second copy
+                entry['span'] = [offset, offset + len(file.urls)]
+                offset += len(file.urls)
+            if file.etag or file.last_modified:
+                files[sitemap_url] = entry
+        if offset != len(urls):
+            files = {}  # files don't add up to ``urls``; revalidation would be wrong
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(site_url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'site_url': site_url, 'fetched_at': time.time(), 'urls': urls, 'files': files}, f)
+        os.replace(tmp_path, path)
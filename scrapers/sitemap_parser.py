@@ -1,91 +1,257 @@
 # scrapers/sitemap_parser.py
 
 """Sitemap parser for extracting URLs from sitemap.xml files."""
+import asyncio
+import gzip
+import io
+import logging
+import zlib
 import aiohttp
-import xml.etree.ElementTree as ET
-from typing import List, Optional
+from lxml import etree
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
+from .sitemap_cache import SitemapValidators
+
+logger = logging.getLogger(__name__)
+
+# Sub-sitemaps of an index fetched at once
+SUB_SITEMAP_CONCURRENCY = 8
+
+_SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+_LOC_TAG = f'{{{_SITEMAP_NS}}}loc'
+
+# aiohttp undoes Content-Encoding itself; .gz files are gunzipped by us
+_FETCH_HEADERS = {'Accept-Encoding': 'gzip'}
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Extra attempts for a sitemap GET answered with one of these statuses,
+# waiting RETRY_BACKOFF seconds, then twice that... Timeouts and connection
+# errors are not retried: the host isn't answering at all
+FETCH_RETRIES = 2
+RETRY_BACKOFF = 0.5
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 class SitemapParser:
     """Parse sitemap.xml files to extract URLs."""
     
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        validators: Optional[Dict[str, SitemapValidators]] = None
+    ):
         """
         Initialize sitemap parser.
         
         Args:
             base_url: The base URL of the website
+            session: Shared HTTP session to reuse; otherwise one is opened
+                by ``async with``, or per fetch if used without it
+            validators: Sitemap files from a previous fetch (see
+                SitemapCache), enabling conditional requests; every sitemap
+                is downloaded in full if omitted
         """
         self.base_url = base_url.rstrip('/')
+        self._session = session
+        self._owns_session = False
+        self._cached_validators = validators or {}
+        # Every sitemap file behind the last get_all_urls() result, in the
+        # order its URLs were concatenated (for SitemapCache.set)
+        self.validators: Dict[str, SitemapValidators] = {}
+
+    @staticmethod
+    def create_session() -> aiohttp.ClientSession:
+        """
+        Create an HTTP session tuned for many small sitemap requests.
+
+        Returns:
+            aiohttp.ClientSession: New session (the caller closes it)
+        """
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=30),
+        )
+
+    async def __aenter__(self) -> "SitemapParser":
+        """Open one session for every probe and sub-sitemap fetch."""
+        if self._session is None:
+            self._session = self.create_session()
+            self._owns_session = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._owns_session:
+            session, self._session = self._session, None
+            self._owns_session = False
+            await session.close()
+
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the shared session, or a temporary one if none is open."""
+        if self._session is not None:
+            yield self._session
+        else:
+            async with self.create_session() as session:
+                yield session
         
-    async def fetch_sitemap(self) -> Optional[str]:
+    async def _fetch(self, session: aiohttp.ClientSession, sitemap_url: str) -> Optional[SitemapValidators]:
+        """
+        Fetch and parse one sitemap file.
+
+        Sends If-None-Match/If-Modified-Since when validators are cached and
+        reuses the cached parse on 304. 429/5xx responses are retried
+        FETCH_RETRIES times with exponential backoff.
+
+        Args:
+            session: HTTP session
+            sitemap_url: URL of the sitemap file
+
+        Returns:
+            Sitemap kind and URLs (as parse_sitemap) with the response's
+            validators, or None if the server doesn't serve it
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: If the request failed
+        """
+        cached = self._cached_validators.get(sitemap_url)
+        headers = dict(_FETCH_HEADERS)
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+
+        for attempt in range(FETCH_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            async with session.get(sitemap_url, timeout=10, headers=headers) as response:
+                if response.status == 304 and cached:
+                    return cached
+                if response.status == 200:
+                    raw = await response.read()
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    break
+                if response.status not in _RETRY_STATUSES or attempt == FETCH_RETRIES:
+                    return None
+
+        kind, urls = await self._parse_in_thread(raw)
+        return SitemapValidators(etag, last_modified, kind, urls)
+
+    async def fetch_sitemap(self) -> Optional[Tuple[str, List[str]]]:
         """
-        Fetch sitemap.xml content.
+        Find the site's sitemap among the usual locations and parse it.
         
         Returns:
-            Optional[str]: Sitemap content or None if not found
+            Optional[Tuple[str, List[str]]]: Sitemap kind and URLs (as
+            parse_sitemap), or None if not found
         """
         sitemap_urls = [
             f"{self.base_url}/sitemap.xml",
             f"{self.base_url}/sitemap_index.xml",
             f"{self.base_url}/sitemap-index.xml",
+            f"{self.base_url}/sitemap.xml.gz",
+            f"{self.base_url}/sitemap_index.xml.gz",
         ]
         
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             for sitemap_url in sitemap_urls:
                 try:
-                    async with session.get(sitemap_url, timeout=10) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            print(f"✅ Found sitemap: {sitemap_url}")
-                            return content
+                    fetched = await self._fetch(session, sitemap_url)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    # The other locations are on the same unresponsive host
+                    logger.warning("⚠️  Sitemap host not responding (%s), skipping other locations", type(e).__name__)
+                    break
                 except Exception as e:
                     continue
+                if fetched is not None:
+                    logger.info("✅ Found sitemap: %s", sitemap_url)
+                    self.validators[sitemap_url] = fetched
+                    return fetched.kind, fetched.urls
         
-        print("❌ No sitemap.xml found")
+        logger.warning("❌ No sitemap.xml found")
         return None
     
-    def parse_sitemap(self, sitemap_content: str) -> List[str]:
+    def parse_sitemap(self, sitemap_content: Union[bytes, str]) -> Tuple[str, List[str]]:
         """
         Parse sitemap XML and extract URLs.
         
+        The XML is stream-parsed: each <loc> is read as soon as it closes
+        and finished elements are dropped, so memory stays flat no matter
+        how large the sitemap is.
+        
         Args:
             sitemap_content: XML content of the sitemap
             
         Returns:
-            List[str]: List of URLs found in sitemap
+            Tuple[str, List[str]]: 'index' for a <sitemapindex> (URLs are
+            child sitemaps) or 'urlset' otherwise, and the URLs found
         """
+        if isinstance(sitemap_content, str):
+            sitemap_content = sitemap_content.encode('utf-8')
+        
+        # <loc> tags in both regular sitemaps and sitemap indexes; un-namespaced
+        # ones are only used if the sitemap has no namespaced ones
         urls = []
+        plain_urls = []
+        kind = None
         
         try:
-            root = ET.fromstring(sitemap_content)
-            
-            # Handle sitemap index (contains references to other sitemaps)
-            namespaces = {
-                'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-                'xhtml': 'http://www.w3.org/1999/xhtml'
-            }
-            
-            # Look for <loc> tags in both regular sitemaps and sitemap indexes
-            for loc in root.findall('.//sm:loc', namespaces):
+            # Sitemaps are untrusted input: no entity expansion or network access
+            context = etree.iterparse(
+                io.BytesIO(sitemap_content),
+                events=('end',),
+                tag=(_LOC_TAG, 'loc'),
+                resolve_entities=False,
+                no_network=True,
+            )
+            for _, loc in context:
+                if kind is None:
+                    root = loc.getroottree().getroot()
+                    kind = 'index' if etree.QName(root).localname == 'sitemapindex' else 'urlset'
                 url = loc.text.strip() if loc.text else None
                 if url:
-                    urls.append(url)
+                    (urls if loc.tag == _LOC_TAG else plain_urls).append(url)
+                
+                # Free this <loc> and every finished element before it
+                loc.clear()
+                node = loc
+                while node.getparent() is not None:
+                    while node.getprevious() is not None:
+                        del node.getparent()[0]
+                    node = node.getparent()
             
-            # Fallback: try without namespace
-            if not urls:
-                for loc in root.findall('.//loc'):
-                    url = loc.text.strip() if loc.text else None
-                    if url:
-                        urls.append(url)
+            urls = urls or plain_urls
+            logger.info("📄 Parsed %s URLs from sitemap", len(urls))
             
-            print(f"📄 Parsed {len(urls)} URLs from sitemap")
+        except (etree.XMLSyntaxError, ValueError) as e:
+            logger.error("❌ Error parsing sitemap XML: %s", e)
+            urls = []
             
-        except ET.ParseError as e:
-            print(f"❌ Error parsing sitemap XML: {e}")
-            
-        return urls
+        return kind or 'urlset', urls
     
+    def _parse_raw(self, raw: bytes) -> Tuple[str, List[str]]:
+        """
+        Gunzip a fetched sitemap body if needed, then parse it.
+
+        Args:
+            raw: Response body (plain or gzipped XML)
+
+        Returns:
+            Tuple[str, List[str]]: Sitemap kind and URLs, as parse_sitemap
+        """
+        if raw[:2] == _GZIP_MAGIC:
+            try:
+                raw = gzip.decompress(raw)
+            except (OSError, EOFError, zlib.error) as e:
+                logger.error("❌ Error decompressing sitemap: %s", e)
+                return 'urlset', []
+        return self.parse_sitemap(raw)
+
+    async def _parse_in_thread(self, raw: bytes) -> Tuple[str, List[str]]:
+        """Run _parse_raw in a worker thread to keep the event loop free."""
+        return await asyncio.to_thread(self._parse_raw, raw)
+
     async def get_all_urls(self) -> List[str]:
         """
         Fetch and parse sitemap to get all URLs.
@@ -93,30 +259,41 @@ class SitemapParser:
         Returns:
             List[str]: List of all URLs from sitemap, or empty list if no sitemap
         """
-        sitemap_content = await self.fetch_sitemap()
+        if self._session is None:
+            # One session for the probes and every sub-sitemap
+            async with self:
+                return await self.get_all_urls()
+
+        self.validators = {}
+        parsed = await self.fetch_sitemap()
         
-        if not sitemap_content:
+        if not parsed:
             return []
         
-        urls = self.parse_sitemap(sitemap_content)
+        kind, urls = parsed
         
         # If we got sitemap index, fetch individual sitemaps
-        if urls and all('.xml' in url for url in urls[:5]):
-            print("🔗 Sitemap index detected, fetching individual sitemaps...")
-            all_urls = []
+        if kind == 'index' and urls:
+            logger.info("🔗 Sitemap index detected, fetching individual sitemaps...")
+            sem = asyncio.Semaphore(SUB_SITEMAP_CONCURRENCY)
             
-            async with aiohttp.ClientSession() as session:
-                for sitemap_url in urls:
+            async def _fetch_one(session: aiohttp.ClientSession, sitemap_url: str) -> Optional[SitemapValidators]:
+                async with sem:
                     try:
-                        async with session.get(sitemap_url, timeout=10) as response:
-                            if response.status == 200:
-                                content = await response.text()
-                                sub_urls = self.parse_sitemap(content)
-                                all_urls.extend(sub_urls)
+                        return await self._fetch(session, sitemap_url)
                     except Exception as e:
-                        print(f"⚠️  Failed to fetch {sitemap_url}: {e}")
-                        continue
+                        logger.warning("⚠️  Failed to fetch %s: %s", sitemap_url, e)
+                        return None
+            
+            async with self._session_scope() as session:
+                fetched = await asyncio.gather(*[_fetch_one(session, url) for url in urls])
+            
+            all_urls = []
+            for sitemap_url, sub_sitemap in zip(urls, fetched):
+                if sub_sitemap is not None:
+                    self.validators[sitemap_url] = sub_sitemap
+                    all_urls.extend(sub_sitemap.urls)
             
             return all_urls
         
-        return urls
\ No newline at end of file
+        return urls
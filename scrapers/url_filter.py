@@ -1,13 +1,35 @@
 # scrapers/url_filter.py
 
 """URL filter using LLM to identify relevant pages."""
+import asyncio
 import json
+import logging
+import os
+import re
 import aiohttp
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urldefrag, urljoin
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from config import get_browser_config, get_llm_config, get_default_search_prompt
 
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to a compiled regex
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+_HREF_XPATH = etree.XPath('//a/@href', smart_strings=False)
+_HTTP_PREFIXES = ('http://', 'https://')
+# XML declaration of XHTML pages; lxml rejects it in str input
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# URLs per LLM request
+LLM_BATCH_SIZE = 100
+# LLM requests in flight at once; match Ollama's OLLAMA_NUM_PARALLEL
+LLM_CONCURRENCY = int(os.getenv('OLLAMA_NUM_PARALLEL', '4'))
+
 class URLFilter:
     def __init__(self, mode="llm", custom_prompt=None, manual_keywords=None):
         self.mode = mode
@@ -18,82 +40,187 @@ class URLFilter:
             'cookie', 'gdpr', 'compliance', 'data-protection',
             'acceptable-use', 'tos', 'terms-of-service'
         ]
+        self._keyword_matcher = self._build_keyword_matcher(self.manual_keywords)
+        # Long-lived session to the LLM server, opened on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @staticmethod
+    def _build_keyword_matcher(keywords: List[str]):
+        """Build an Aho-Corasick automaton (or regex) matching any lowercased keyword."""
+        keywords = [kw.lower() for kw in keywords if kw]
+        if not keywords:
+            return None
+        if ahocorasick is None:
+            return re.compile('|'.join(map(re.escape, keywords)))
+        automaton = ahocorasick.Automaton()
+        for kw in keywords:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return automaton
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared LLM session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=LLM_CONCURRENCY, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared LLM session."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
     
     def _extract_links_from_html(self, html_content: str, base_url: str) -> List[str]:
-        soup = BeautifulSoup(html_content, 'lxml')
+        try:
+            tree = lxml_html.fromstring(_XML_DECLARATION.sub('', html_content, count=1))
+        except etree.ParserError:
+            # Empty document
+            return []
         links = []
-        for anchor in soup.find_all('a', href=True):
-            href = anchor['href']
-            if href.startswith('/'):
-                href = base_url.rstrip('/') + href
-            elif not href.startswith('http'):
+        for href in _HREF_XPATH(tree):
+            # Resolves ./x, ../x, //host/x and ?q=1 too; fragments only
+            # point within a page, so they're dropped
+            try:
+                url = urldefrag(urljoin(base_url, href.strip())).url
+            except ValueError:
+                # Malformed href, e.g. an unterminated IPv6 host
                 continue
-            if href.startswith(('http://', 'https://')):
-                links.append(href)
+            if url.startswith(_HTTP_PREFIXES):
+                links.append(url)
         return list(dict.fromkeys(links))
 
     async def filter_urls(self, urls: List[str]) -> List[str]:
         if not urls: return []
         
         if self.mode == "manual":
-            print(f"⚙️  Manual filtering with {len(self.manual_keywords)} keywords...")
+            logger.info("⚙️  Manual filtering with %s keywords...", len(self.manual_keywords))
             return self._keyword_fallback(urls)
         
         return await self._filter_urls_with_llm(urls)
 
+    async def iter_filter_urls(self, urls: List[str]) -> AsyncIterator[List[str]]:
+        """Yield relevant URLs batch by batch as they are identified, without duplicates."""
+        if not urls: return
+
+        if self.mode == "manual":
+            logger.info("⚙️  Manual filtering with %s keywords...", len(self.manual_keywords))
+            yield self._keyword_fallback(urls)
+            return
+
+        seen = set()
+        async for relevant_urls in self._iter_llm_batches(urls):
+            fresh = [url for url in dict.fromkeys(relevant_urls) if url not in seen]
+            seen.update(fresh)
+            if fresh:
+                yield fresh
+
+    def _start_llm_batches(self, urls: List[str]) -> List["asyncio.Task[List[str]]"]:
+        """Start one task per batch; at most LLM_CONCURRENCY query the LLM at once."""
+        batch_size = LLM_BATCH_SIZE
+        sem = asyncio.Semaphore(LLM_CONCURRENCY)
+
+        async def _filter_batch(number: int, batch: List[str]) -> List[str]:
+            async with sem:
+                try:
+                    return await self._call_llm_api(batch) or []
+                except Exception as e:
+                    logger.warning("⚠️  Batch %s LLM failed, using keyword fallback...", number)
+                    return self._keyword_fallback(batch)
+
+        logger.info("🤖 LLM filtering %s URLs in batches of %s...", len(urls), batch_size)
+        return [
+            asyncio.create_task(_filter_batch(i // batch_size + 1, urls[i:i + batch_size]))
+            for i in range(0, len(urls), batch_size)
+        ]
+
+    async def _iter_llm_batches(self, urls: List[str]) -> AsyncIterator[List[str]]:
+        """Filter batches concurrently, yielding each batch's result as it completes."""
+        tasks = self._start_llm_batches(urls)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def _filter_urls_with_llm(self, urls: List[str]) -> List[str]:
-        batch_size = 100
-        all_relevant_urls = []
-        
-        print(f"🤖 LLM filtering {len(urls)} URLs in batches of {batch_size}...")
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i:i + batch_size]
-            try:
-                relevant_urls = await self._call_llm_api(batch)
-                if relevant_urls:
-                    all_relevant_urls.extend(relevant_urls)
-            except Exception as e:
-                print(f"⚠️  Batch {i//batch_size + 1} LLM failed, using keyword fallback...")
-                all_relevant_urls.extend(self._keyword_fallback(batch))
-        
-        return list(set(all_relevant_urls))
+        # Batches run concurrently but are combined in batch order, so the
+        # result doesn't depend on which LLM call finishes first
+        tasks = self._start_llm_batches(urls)
+        try:
+            batches = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        # Insertion-ordered dedupe (a set would scramble the order): each URL
+        # keeps the position of its first occurrence in ``urls``
+        all_relevant_urls = {}
+        for relevant_urls in batches:
+            all_relevant_urls.update(dict.fromkeys(relevant_urls))
+        return list(all_relevant_urls)
 
     async def _call_llm_api(self, urls: List[str]) -> List[str]:
         llm_config = get_llm_config()
+        # The model answers with indices, not URLs, to keep its output short
+        numbered = "\n".join(f"{i}. {url}" for i, url in enumerate(urls))
         prompt = f"""Identify relevant URLs for: {self.search_prompt}
         
         URLs:
-        {chr(10).join(f"- {url}" for url in urls)}
+        {numbered}
 
-        Return JSON structure: {{"relevant_urls": ["url1", "url2"], "reasoning": "str"}}
+        Return JSON structure: {{"indices": [0, 3]}} listing the numbers of the relevant URLs
         """
 
         base_url = llm_config.get('base_url', 'http://localhost:11434')
         model = llm_config.get('provider', 'phi4-mini-reasoning').replace('ollama/', '')
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{base_url}/api/generate",
-                json={"model": model, "prompt": prompt, "stream": False, "format": "json"},
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    data = json.loads(result.get('response', '{}'))
-                    return data.get('relevant_urls', [])
-                return []
+        session = await self._ensure_session()
+        async with session.post(
+            f"{base_url}/api/generate",
+            json={
+                "model": model,
+                "prompt": prompt,
+                "stream": False,
+                "format": "json",
+                # Deterministic, and capped near the size of an all-indices answer
+                "options": {
+                    "num_predict": max(256, len(urls) * 8),
+                    "temperature": 0,
+                    "top_p": 1.0,
+                },
+            },
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                data = json.loads(result.get('response', '{}'))
+                # Sorted, so relevant URLs keep their input order whatever
+                # order the model lists them in
+                indices = sorted({
+                    int(i) for i in data.get('indices', [])
+                    if str(i).isdigit() and int(i) < len(urls)
+                })
+                return [urls[i] for i in indices]
+            return []
 
     def _keyword_fallback(self, urls: List[str]) -> List[str]:
-        filtered = []
-        for url in urls:
-            url_lower = url.lower()
-            if any(kw.lower() in url_lower for kw in self.manual_keywords):
-                filtered.append(url)
-        return filtered
-
-    async def get_homepage_links(self, start_url: str) -> List[str]:
-        async with AsyncWebCrawler(config=get_browser_config()) as crawler:
-            result = await crawler.arun(url=start_url, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
-            if result.success:
-                return self._extract_links_from_html(result.html, start_url)
-            return []
\ No newline at end of file
+        # One scan per URL for all keywords at once
+        matcher = self._keyword_matcher
+        if matcher is None:
+            return []
+        if ahocorasick is None:
+            return [url for url in urls if matcher.search(url.lower())]
+        return [url for url in urls if next(matcher.iter(url.lower()), None) is not None]
+
+    async def get_homepage_links(self, start_url: str, crawler: Optional[AsyncWebCrawler] = None) -> List[str]:
+        if crawler is None:
+            async with AsyncWebCrawler(config=get_browser_config()) as own_crawler:
+                return await self.get_homepage_links(start_url, own_crawler)
+
+        result = await crawler.arun(url=start_url, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+        if result.success:
+            # lxml parsing is CPU-bound; keep the event loop free meanwhile
+            return await asyncio.to_thread(self._extract_links_from_html, result.html, start_url)
+        return []
\ No newline at end of file
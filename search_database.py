@@ -8,11 +8,12 @@ Usage:
     python search_database.py "privacy policy"
     python search_database.py "data protection" --threshold 0.7
     python search_database.py "cookie policy" --limit 5
+    python search_database.py --queries-file queries.txt
 """
 
 import sys
 import argparse
-from utils import DatabaseHandler
+from utils import DatabaseHandler, log_to_console
 
 
 def search(query_text: str, threshold: float = 0.5, limit: int = 10):
@@ -33,11 +34,48 @@ def search(query_text: str, threshold: float = 0.5, limit: int = 10):
     print("=" * 80)
     print()
 
-    db_handler = DatabaseHandler()
-
     print("🔍 Searching database...")
-    results = db_handler.search_similar(query_text, threshold, limit)
+    results = DatabaseHandler().search_similar(query_text, threshold, limit)
+    print_results(results)
+
+
+def search_many(queries_file: str, threshold: float = 0.5, limit: int = 10):
+    """
+    Search for every query in a file, embedding them all in one batch.
 
+    Args:
+        queries_file: Path to a file with one query per line
+        threshold: Minimum similarity score (0-1)
+        limit: Maximum number of results per query
+    """
+    with open(queries_file, 'r', encoding='utf-8') as f:
+        queries = [line.strip() for line in f if line.strip()]
+
+    if not queries:
+        print(f"❌ No queries found in {queries_file}")
+        return
+
+    print(f"🔍 Searching database for {len(queries)} queries...")
+    # Many queries in one process, so loading the embeddings once pays off
+    all_results = DatabaseHandler().search_similar_batch(
+        queries, threshold, limit, in_memory=len(queries) > 1
+    )
+
+    for query_text, results in zip(queries, all_results):
+        print()
+        print("=" * 80)
+        print(f"Query: {query_text}")
+        print("=" * 80)
+        print_results(results)
+
+
+def print_results(results):
+    """
+    Print search results.
+
+    Args:
+        results: Matching pages from DatabaseHandler.search_similar
+    """
     if not results:
         print("❌ No results found")
         print("\nTips:")
@@ -64,8 +102,7 @@ def list_sessions():
     print("=" * 80)
     print()
 
-    db_handler = DatabaseHandler()
-    sessions = db_handler.get_session_stats()
+    sessions = DatabaseHandler().get_session_stats()
 
     if not sessions:
         print("❌ No scraping sessions found")
@@ -120,11 +157,19 @@ def main():
         action='store_true',
         help='List all scraping sessions'
     )
+    parser.add_argument(
+        '--queries-file',
+        help='Search for every query in this file (one per line)'
+    )
 
     args = parser.parse_args()
+    # Database handler progress and errors
+    log_to_console("utils")
 
     if args.list_sessions:
         list_sessions()
+    elif args.queries_file:
+        search_many(args.queries_file, args.threshold, args.limit)
     elif args.query:
         search(args.query, args.threshold, args.limit)
     else:
@@ -133,6 +178,7 @@ def main():
         print("  python search_database.py \"privacy policy\"")
         print("  python search_database.py \"data protection\" --threshold 0.7")
         print("  python search_database.py --list-sessions")
+        print("  python search_database.py --queries-file queries.txt")
 
 
 if __name__ == "__main__":
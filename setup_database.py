@@ -6,10 +6,13 @@ This script initializes the PostgreSQL database with pgvector extension
 and creates the required tables for the scraper.
 
 Usage:
-    python setup_database.py
+    python setup_database.py            # create (or recreate) all tables
+    python setup_database.py --migrate  # upgrade an existing database in place
 """
 
+import argparse
 import psycopg2
+import sqlparse
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import sys
 from config.db_config import DatabaseConfig
@@ -62,6 +65,28 @@ def create_database():
         sys.exit(1)
 
 
+def execute_sql_file(cursor, path: str):
+    """
+    Execute a SQL file one statement at a time.
+
+    Args:
+        cursor: Open database cursor
+        path: Path of the SQL file
+    """
+    with open(path, 'r') as f:
+        sql = f.read()
+
+    # One statement at a time, so a failure names the statement at fault
+    for statement in sqlparse.split(sql):
+        if not statement.strip():
+            continue
+        try:
+            cursor.execute(statement)
+        except psycopg2.Error:
+            print(f"❌ Failed statement:\n{statement}")
+            raise
+
+
 def setup_schema():
     """Create tables and extensions using schema.sql."""
     config = DatabaseConfig()
@@ -71,42 +96,35 @@ def setup_schema():
         conn = psycopg2.connect(**config.get_connection_params())
         cursor = conn.cursor()
 
-        print("📋 Reading schema.sql...")
-
-        # Read and execute schema.sql
-        with open('schema.sql', 'r') as f:
-            schema_sql = f.read()
+        print("🔧 Creating extensions and tables from schema.sql...")
+        execute_sql_file(cursor, 'schema.sql')
 
-        print("🔧 Creating extensions and tables...")
-        cursor.execute(schema_sql)
-        conn.commit()
-
-        print("✅ Schema created successfully")
-
-        # Verify tables
+        # Verify tables and the pgvector extension in one round-trip,
+        # inside the same transaction as the DDL
         cursor.execute("""
-            SELECT table_name
+            SELECT 'table', table_name::text, NULL::text
             FROM information_schema.tables
             WHERE table_schema = 'public'
             AND table_type = 'BASE TABLE'
-            ORDER BY table_name
+            UNION ALL
+            SELECT 'extension', extname::text, extversion::text
+            FROM pg_extension
+            WHERE extname = 'vector'
+            ORDER BY 1 DESC, 2
         """)
+        rows = cursor.fetchall()
+        conn.commit()
 
-        tables = cursor.fetchall()
+        print("✅ Schema created successfully")
+
+        tables = [row[1] for row in rows if row[0] == 'table']
         print(f"\n📊 Created {len(tables)} tables:")
         for table in tables:
-            print(f"   - {table[0]}")
-
-        # Verify pgvector extension
-        cursor.execute("""
-            SELECT extname, extversion
-            FROM pg_extension
-            WHERE extname = 'vector'
-        """)
+            print(f"   - {table}")
 
-        vector_ext = cursor.fetchone()
+        vector_ext = next((row for row in rows if row[0] == 'extension'), None)
         if vector_ext:
-            print(f"\n✅ pgvector extension installed (version {vector_ext[1]})")
+            print(f"\n✅ pgvector extension installed (version {vector_ext[2]})")
         else:
             print("\n⚠️  pgvector extension not found!")
             print("   Install it with: CREATE EXTENSION vector;")
@@ -129,6 +147,36 @@ def setup_schema():
         sys.exit(1)
 
 
+def migrate_schema():
+    """Upgrade an existing database in place using migrate_halfvec.sql."""
+    config = DatabaseConfig()
+
+    try:
+        conn = psycopg2.connect(**config.get_connection_params())
+        cursor = conn.cursor()
+
+        print("🔧 Converting embeddings to halfvec and rebuilding the index...")
+        # All statements run in one transaction: either everything is
+        # migrated or nothing changes
+        execute_sql_file(cursor, 'migrate_halfvec.sql')
+        conn.commit()
+        print("✅ Migration complete (existing data kept)")
+
+        cursor.close()
+        conn.close()
+
+    except FileNotFoundError:
+        print("❌ Error: migrate_halfvec.sql file not found")
+        print("   Make sure you're running this script from the project root directory")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error migrating schema: {e}")
+        print("\nTroubleshooting:")
+        print("1. halfvec needs pgvector 0.7.0 or newer (ALTER EXTENSION vector UPDATE;)")
+        print("2. Check if your user owns the scraped_pages table")
+        sys.exit(1)
+
+
 def test_connection():
     """Test database connection and vector operations."""
     config = DatabaseConfig()
@@ -157,6 +205,12 @@ def test_connection():
 
 def main():
     """Main setup function."""
+    parser = argparse.ArgumentParser(description="Set up the scraper database")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Upgrade an existing database in place instead of "
+                             "recreating its tables (keeps scraped data)")
+    args = parser.parse_args()
+
     print("=" * 80)
     print("POLICY SCRAPER - DATABASE SETUP")
     print("=" * 80)
@@ -166,8 +220,11 @@ def main():
     create_database()
     print()
 
-    # Step 2: Create schema
-    setup_schema()
+    # Step 2: Create or migrate schema
+    if args.migrate:
+        migrate_schema()
+    else:
+        setup_schema()
     print()
 
     # Step 3: Test connection
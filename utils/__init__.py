@@ -1,7 +1,32 @@
 # utils/init.py
 
-from .file_handler import FileHandler
-from .url_utils import URLUtils
-from .db_handler import DatabaseHandler
+import importlib
 
-__all__ = ['FileHandler', 'URLUtils', 'DatabaseHandler']
\ No newline at end of file
+from .singleton import SingletonMixin
+
+# Heavy handlers (psycopg2, sentence-transformers) load on first access (PEP 562)
+_LAZY_ATTRS = {
+    'FileHandler': '.file_handler',
+    'URLUtils': '.url_utils',
+    'DatabaseHandler': '.db_handler',
+    'QueryCache': '.query_cache',
+    'AnswerCache': '.answer_cache',
+    'console_handler': '.logging_utils',
+    'log_to_console': '.logging_utils',
+}
+
+__all__ = ['SingletonMixin', 'FileHandler', 'URLUtils', 'DatabaseHandler', 'QueryCache', 'AnswerCache',
+           'console_handler', 'log_to_console']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,77 @@
+# utils/answer_cache.py
+
+"""Process-wide cache of generated answers for near-duplicate questions."""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .query_cache import SemanticCache
+
+
+class AnswerCache(SemanticCache):
+    """
+    LRU + TTL cache of RAG answers keyed by question embedding.
+
+    A new question hits when a previously answered one (asked with the same
+    threshold and k) has cosine similarity of at least ``tau`` with it, so
+    both retrieval and generation can be skipped.
+    """
+
+    def __init__(self, max_size: int = 128, ttl_seconds: float = 3600):
+        """
+        Initialize answer cache.
+
+        Args:
+            max_size: Maximum number of cached answers
+            ttl_seconds: Seconds before a cached answer expires
+        """
+        super().__init__(max_size, ttl_seconds)
+
+    def get(
+        self,
+        embedding: Optional[Sequence[float]],
+        threshold: float,
+        k: int,
+        tau: float = 0.95
+    ) -> Optional[Tuple[str, str, List[Dict]]]:
+        """
+        Look up the answer to a near-duplicate question.
+
+        Args:
+            embedding: Embedding of the incoming question
+            threshold: Similarity threshold used for retrieval
+            k: Maximum number of retrieved documents
+            tau: Minimum cosine similarity between the two questions
+
+        Returns:
+            Tuple of (cached question, answer, sources), or None on a miss
+        """
+        hit = self._lookup_semantic(embedding, threshold, k, tau)
+        if hit is None:
+            return None
+        key, (answer, sources) = hit
+        return key[0], answer, sources
+
+    def put(
+        self,
+        question: str,
+        embedding: Optional[Sequence[float]],
+        threshold: float,
+        k: int,
+        answer: str,
+        sources: List[Dict]
+    ) -> None:
+        """
+        Cache the answer to a question.
+
+        Args:
+            question: Question text
+            embedding: Embedding of the question
+            threshold: Similarity threshold used for retrieval
+            k: Maximum number of retrieved documents
+            answer: Generated answer
+            sources: Source metadata (title, url, similarity) of the answer
+        """
+        # Answers are only ever found semantically, so skip unembedded ones
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        self._store(self.make_key(question, threshold, k), vector, (answer, sources))
@@ -1,56 +1,224 @@
 """Database handler for storing scraped data in PostgreSQL with pgvector."""
-import psycopg2
-from psycopg2.extras import execute_values
+import io
+import logging
+import struct
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
+import torch
 from typing import List, Dict, Optional
-from datetime import datetime
+from pgvector.psycopg2 import register_vector
+from psycopg2.extras import RealDictCursor
 from sentence_transformers import SentenceTransformer
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.db_config import DatabaseConfig
+from .singleton import SingletonMixin
+from .query_cache import QueryCache
+from .answer_cache import AnswerCache
+
+try:
+    import simsimd
+except ImportError:  # optional: fall back to a NumPy dot product
+    simsimd = None
+
+logger = logging.getLogger(__name__)
+
+# Characters of page content fed to the embedding model
+EMBEDDING_MAX_CHARS = 5000
+# Texts per SentenceTransformer forward pass (on CPU / on GPU)
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_GPU_BATCH_SIZE = 128
+# Pages per encode() call when saving; each chunk is copied in
+# --db-batch-size batches while the next one is embedded
+EMBEDDING_CHUNK_SIZE = 1024
+# Pages copied per batch when saving
+DEFAULT_DB_BATCH_SIZE = 100
+# With in_memory=True, corpora up to this many embedded pages are searched
+# in memory; larger ones go through pgvector's search_similar_content()
+IN_MEMORY_SEARCH_MAX_ROWS = 50000
+# Seconds before the in-memory embedding matrix is reloaded from the table
+IN_MEMORY_SEARCH_TTL = 300
+# Candidates per requested result taken from the int8 scan for exact rescoring
+IN_MEMORY_SEARCH_OVERSAMPLE = 4
+# HNSW candidate list size for index searches (pgvector's default is 40)
+HNSW_EF_SEARCH = 100
+
+# /proc/cpuinfo flags of CPUs with native bfloat16 matrix instructions
+_BF16_CPU_FLAGS = ('avx512_bf16', 'amx_bf16')
+# Int8-quantized ONNX export shipped with sentence-transformers models,
+# used by the 'onnx-int8' backend on CPUs with AVX512-VNNI
+_ONNX_VNNI_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+
+
+@lru_cache(maxsize=1)
+def _cpu_flags() -> frozenset:
+    """
+    Read the CPU feature flags.
+
+    Returns:
+        frozenset: Flags from /proc/cpuinfo (empty where unavailable)
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    return frozenset(line.split(':', 1)[1].split())
+    except OSError:
+        pass
+    return frozenset()
+
+
+def _load_onnx_model(model_name: str, on_gpu: bool, int8: bool) -> SentenceTransformer:
+    """
+    Load an embedding model on the ONNX Runtime backend.
+
+    Args:
+        model_name: SentenceTransformer model name or path
+        on_gpu: Run on CUDA instead of the CPU
+        int8: Use the int8-quantized export (CPU with AVX512-VNNI only)
+
+    Returns:
+        SentenceTransformer: Model backed by ONNX Runtime
+    """
+    if on_gpu:
+        return SentenceTransformer(
+            model_name, backend='onnx',
+            model_kwargs={'provider': 'CUDAExecutionProvider'}
+        )
+    if int8:
+        if 'avx512_vnni' in _cpu_flags():
+            return SentenceTransformer(
+                model_name, backend='onnx',
+                model_kwargs={'file_name': _ONNX_VNNI_FILE}
+            )
+        logger.info("   No AVX512-VNNI, using the full-precision ONNX export")
+    return SentenceTransformer(model_name, backend='onnx')
+
+
+@lru_cache(maxsize=4)
+def _load_embedding_model(model_name: str, backend: str = 'torch') -> SentenceTransformer:
+    """
+    Load an embedding model once per process.
+
+    The 'onnx' and 'onnx-int8' backends run the model on ONNX Runtime
+    (the latter int8-quantized, on CPUs with AVX512-VNNI), falling back to
+    PyTorch if it can't be loaded. On PyTorch it runs in FP16 on GPU, or
+    BF16 on CPUs that support it.
+
+    Embeddings from different backends differ slightly, so pages and
+    queries should be embedded with the same one.
+
+    Args:
+        model_name: SentenceTransformer model name or path
+        backend: 'torch', 'onnx' or 'onnx-int8'
+
+    Returns:
+        SentenceTransformer: Loaded model, shared by every caller
+    """
+    on_gpu = torch.cuda.is_available()
+    if backend in ('onnx', 'onnx-int8'):
+        try:
+            model = _load_onnx_model(model_name, on_gpu, int8=backend == 'onnx-int8')
+            logger.info("   Using ONNX Runtime embedding inference")
+            return model
+        except Exception as e:
+            logger.info("   ONNX backend unavailable (%s), using PyTorch", e)
+
+    model = SentenceTransformer(model_name)
+    if on_gpu:
+        model.half()
+        logger.info("   Using FP16 embedding inference")
+    elif any(flag in _cpu_flags() for flag in _BF16_CPU_FLAGS):
+        model.to(torch.bfloat16)
+        logger.info("   Using BF16 embedding inference")
+    return model
+
+
+# Framing of COPY's binary format
+_COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+_COPY_TRAILER = struct.pack('>h', -1)
+_COPY_NULL = struct.pack('>i', -1)
+
+
+def _copy_int4(value) -> bytes:
+    """Encode an INTEGER field of a binary COPY row."""
+    if value is None:
+        return _COPY_NULL
+    return struct.pack('>ii', 4, int(value))
+
+
+def _copy_text(value) -> bytes:
+    """Encode a TEXT/VARCHAR field of a binary COPY row."""
+    if value is None:
+        return _COPY_NULL
+    data = str(value).encode('utf-8')
+    return struct.pack('>i', len(data)) + data
 
 
-class DatabaseHandler:
+def _copy_halfvec(value) -> bytes:
+    """Encode a halfvec field of a binary COPY row (dim, unused, big-endian halves)."""
+    if value is None:
+        return _COPY_NULL
+    halves = np.asarray(value, dtype='>f2')
+    return struct.pack('>ihh', 4 + 2 * len(halves), len(halves), 0) + halves.tobytes()
+
+
+class DatabaseHandler(SingletonMixin):
     """Handle database operations for scraped data with vector embeddings."""
 
     def __init__(self):
         """Initialize database handler with embedding model."""
+        if self._initialized:
+            return
         self.config = DatabaseConfig()
         self.conn = None
         self.embedding_model = None
-        print(f"🔧 Loading embedding model: {self.config.EMBEDDING_MODEL}")
+        # (loaded_at, page ids, int8 embedding matrix, per-row scales);
+        # the matrix is None when the table is too large to search in memory
+        self._cache_matrix_state = None
+        # Pooled connections that already have the pgvector adapter
+        self._vector_registered = weakref.WeakSet()
+        logger.info("🔧 Loading embedding model: %s", self.config.EMBEDDING_MODEL)
         try:
-            self.embedding_model = SentenceTransformer(self.config.EMBEDDING_MODEL)
-            print("✅ Embedding model loaded successfully")
+            self.embedding_model = _load_embedding_model(
+                self.config.EMBEDDING_MODEL, self.config.EMBEDDING_BACKEND
+            )
+            logger.info("✅ Embedding model loaded successfully")
         except Exception as e:
-            print(f"⚠️  Warning: Could not load embedding model: {e}")
-            print("   Embeddings will be stored as NULL")
+            logger.warning("⚠️  Warning: Could not load embedding model: %s", e)
+            logger.warning("   Embeddings will be stored as NULL")
+        self._initialized = True
 
     def connect(self) -> bool:
         """
-        Connect to PostgreSQL database.
+        Take a connection to the PostgreSQL database from the shared pool.
 
         Returns:
             bool: True if connected successfully
         """
         try:
-            self.conn = psycopg2.connect(**self.config.get_connection_params())
-            print(f"✅ Connected to database: {self.config.NAME}")
+            self.conn = self.config.get_pool().getconn()
+            if self.conn not in self._vector_registered:
+                # Send numpy embeddings as pgvector values without list
+                # conversion; this costs a type lookup, so once per connection
+                register_vector(self.conn)
+                self._vector_registered.add(self.conn)
+            logger.info("✅ Connected to database: %s", self.config.NAME)
             return True
         except Exception as e:
-            print(f"❌ Database connection failed: {e}")
-            print(f"   Make sure PostgreSQL is running and database '{self.config.NAME}' exists")
+            logger.error("❌ Database connection failed: %s", e)
+            logger.error("   Make sure PostgreSQL is running and database '%s' exists", self.config.NAME)
             return False
 
     def disconnect(self):
-        """Close database connection."""
+        """Return the database connection to the pool."""
         if self.conn:
-            self.conn.close()
+            # The pool rolls back any transaction left open
+            self.config.get_pool().putconn(self.conn)
             self.conn = None
 
-    def _generate_embedding(self, text: str) -> Optional[List[float]]:
+    def _generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """
         Generate vector embedding for text.
 
@@ -58,28 +226,82 @@ class DatabaseHandler:
             text: Text to embed
 
         Returns:
-            List of floats representing the embedding, or None if model not loaded
+            Unit-length array holding the embedding, or None if model not loaded
         """
         if not self.embedding_model or not text:
             return None
 
         try:
-            # Truncate text if too long (model has token limit)
-            max_length = 5000  # characters
-            if len(text) > max_length:
-                text = text[:max_length]
-
-            embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            return self.embedding_model.encode(
+                text, convert_to_numpy=True, normalize_embeddings=True
+            )
         except Exception as e:
-            print(f"⚠️  Warning: Could not generate embedding: {e}")
+            logger.warning("⚠️  Warning: Could not generate embedding: %s", e)
             return None
 
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a query text for similarity search.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding as a unit-length array, or None if unavailable
+        """
+        return self._generate_embedding(text)
+
+    def _generate_embeddings(
+        self,
+        texts: List[str],
+        show_progress_bar: bool = False
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Generate vector embeddings for several texts in one model call.
+
+        Args:
+            texts: Texts to embed
+            show_progress_bar: Show the model's progress bar while encoding
+
+        Returns:
+            One embedding per text, None for empty texts or if the model is
+            unavailable
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        if not self.embedding_model:
+            return embeddings
+
+        indices = [idx for idx, text in enumerate(texts) if text]
+        if not indices:
+            return embeddings
+
+        try:
+            on_gpu = self.embedding_model.device.type == 'cuda'
+            # Keep batch outputs on the device and copy them to the host once
+            encoded = self.embedding_model.encode(
+                [texts[idx] for idx in indices],
+                batch_size=EMBEDDING_GPU_BATCH_SIZE if on_gpu else EMBEDDING_BATCH_SIZE,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                show_progress_bar=show_progress_bar
+            )
+            if encoded.dtype == torch.bfloat16:
+                # NumPy has no bfloat16
+                encoded = encoded.float()
+            encoded = encoded.cpu().numpy()
+            for idx, embedding in zip(indices, encoded):
+                embeddings[idx] = embedding
+        except Exception as e:
+            logger.warning("⚠️  Warning: Could not generate embeddings: %s", e)
+
+        return embeddings
+
     def save_scrape_session(
         self,
         website_url: str,
         domain_name: str,
-        stats: Dict
+        stats: Dict,
+        commit: bool = True
     ) -> Optional[int]:
         """
         Save scraping session metadata.
@@ -88,12 +310,14 @@ class DatabaseHandler:
             website_url: The URL of the website scraped
             domain_name: Domain name extracted from URL
             stats: Dictionary containing scraping statistics
+            commit: Commit right away; pass False to leave the row in the
+                open transaction so it commits (or rolls back) with its pages
 
         Returns:
             Session ID if successful, None otherwise
         """
         if not self.conn:
-            print("❌ No database connection")
+            logger.error("❌ No database connection")
             return None
 
         try:
@@ -115,80 +339,142 @@ class DatabaseHandler:
             ))
 
             session_id = cursor.fetchone()[0]
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             cursor.close()
 
             return session_id
         except Exception as e:
-            print(f"❌ Error saving scrape session: {e}")
+            logger.error("❌ Error saving scrape session: %s", e)
             self.conn.rollback()
             return None
 
+    def _copy_pages(
+        self,
+        session_id: int,
+        pages: List[Dict],
+        contents: List[str],
+        embeddings: List[Optional[np.ndarray]]
+    ):
+        """
+        Stream one batch of pages into scraped_pages with COPY.
+
+        Args:
+            session_id: ID of the scrape session
+            pages: Page dictionaries
+            contents: Content of each page
+            embeddings: Embedding of each page (None where unavailable)
+        """
+        # Binary COPY sends embeddings as raw halves instead of decimal text
+        buf = io.BytesIO()
+        buf.write(_COPY_SIGNATURE)
+        for page, content, embedding in zip(pages, contents, embeddings):
+            buf.write(b''.join((
+                struct.pack('>h', 8),
+                _copy_int4(session_id),
+                _copy_text(page.get('url')),
+                _copy_text(page.get('title')),
+                _copy_text(page.get('description')),
+                _copy_text(page.get('page_type')),
+                _copy_text(content),
+                _copy_int4(page.get('word_count')),
+                _copy_halfvec(embedding)
+            )))
+        buf.write(_COPY_TRAILER)
+        buf.seek(0)
+
+        cursor = self.conn.cursor()
+        cursor.copy_expert(
+            """
+            COPY scraped_pages
+            (session_id, url, title, description, page_type,
+             content, word_count, content_embedding)
+            FROM STDIN WITH (FORMAT binary)
+            """,
+            buf
+        )
+        cursor.close()
+
     def save_scraped_pages(
         self,
         session_id: int,
-        pages: List[Dict]
+        pages: List[Dict],
+        batch_size: int = DEFAULT_DB_BATCH_SIZE,
+        synchronous_commit: bool = True
     ) -> bool:
         """
         Save scraped pages with vector embeddings.
 
+        Pages are embedded EMBEDDING_CHUNK_SIZE at a time and each chunk is
+        streamed in ``batch_size`` pages per ``COPY ... FROM STDIN`` on a
+        writer thread while the next chunk is embedded, all inside a single transaction (which
+        also holds the session row when called from save_all).
+
         Args:
             session_id: ID of the scrape session
             pages: List of page dictionaries
+            batch_size: Pages per COPY
+            synchronous_commit: Wait for the WAL flush on commit. Only pass
+                False when the session row is in the same transaction
 
         Returns:
             bool: True if successful
         """
         if not self.conn:
-            print("❌ No database connection")
+            logger.error("❌ No database connection")
             return False
 
         try:
-            cursor = self.conn.cursor()
-
-            # Prepare data with embeddings
-            print(f"🔄 Generating embeddings for {len(pages)} pages...")
-            rows = []
-            for idx, page in enumerate(pages, 1):
-                # Generate embedding for content
-                content = page.get('content', '')
-                embedding = self._generate_embedding(content)
-
-                rows.append((
-                    session_id,
-                    page.get('url'),
-                    page.get('title'),
-                    page.get('description'),
-                    page.get('page_type'),
-                    content,
-                    page.get('word_count'),
-                    embedding
-                ))
-
-                if idx % 10 == 0 or idx == len(pages):
-                    print(f"   Generated {idx}/{len(pages)} embeddings...")
-
-            # Batch insert all pages
-            execute_values(
-                cursor,
-                """
-                INSERT INTO scraped_pages
-                (session_id, url, title, description, page_type,
-                 content, word_count, content_embedding)
-                VALUES %s
-                """,
-                rows,
-                template="(%s, %s, %s, %s, %s, %s, %s, %s)"
-            )
+            if not synchronous_commit:
+                # Don't wait for the WAL flush on commit. A server crash right
+                # after it can lose the whole just-saved session (row and
+                # pages alike) but never keep only part of it
+                cursor = self.conn.cursor()
+                cursor.execute("SET LOCAL synchronous_commit = OFF")
+                cursor.close()
+
+            logger.info("🔄 Generating embeddings for %s pages...", len(pages))
+            # One writer thread copies each batch while the next is embedded;
+            # both use self.conn, but only the writer touches it meanwhile
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending = []
+                try:
+                    for start in range(0, len(pages), EMBEDDING_CHUNK_SIZE):
+                        chunk = pages[start:start + EMBEDDING_CHUNK_SIZE]
+                        contents = [page.get('content') or '' for page in chunk]
+                        # Truncate once here (model has token limit); the
+                        # full content is still stored
+                        embeddings = self._generate_embeddings(
+                            [content[:EMBEDDING_MAX_CHARS] for content in contents],
+                            show_progress_bar=len(chunk) > EMBEDDING_BATCH_SIZE
+                        )
+                        logger.info("   Embedded %s/%s pages...", start + len(chunk), len(pages))
+                        for offset in range(0, len(chunk), batch_size):
+                            end = offset + batch_size
+                            pending.append(writer.submit(
+                                self._copy_pages, session_id, chunk[offset:end],
+                                contents[offset:end], embeddings[offset:end]
+                            ))
+                        # Stop embedding as soon as a write has failed
+                        while pending and pending[0].done():
+                            pending.pop(0).result()
+                    for future in pending:
+                        future.result()
+                finally:
+                    for future in pending:
+                        future.cancel()
 
             self.conn.commit()
-            cursor.close()
+            # Cached search results and answers may no longer reflect the table
+            QueryCache().clear()
+            AnswerCache().clear()
+            self._cache_matrix_state = None
 
-            print(f"✅ Saved {len(pages)} pages to database")
+            logger.info("✅ Saved %s pages to database", len(pages))
             return True
 
         except Exception as e:
-            print(f"❌ Error saving scraped pages: {e}")
+            logger.error("❌ Error saving scraped pages: %s", e)
             self.conn.rollback()
             return False
 
@@ -197,7 +483,8 @@ class DatabaseHandler:
         data: List[Dict],
         website_url: str,
         domain_name: str,
-        stats: Dict
+        stats: Dict,
+        batch_size: int = DEFAULT_DB_BATCH_SIZE
     ) -> bool:
         """
         Save complete scraping session (metadata + pages).
@@ -207,6 +494,7 @@ class DatabaseHandler:
             website_url: URL of scraped website
             domain_name: Domain name
             stats: Scraping statistics
+            batch_size: Pages per COPY
 
         Returns:
             bool: True if successful
@@ -215,26 +503,205 @@ class DatabaseHandler:
             return False
 
         try:
-            # Save session metadata
-            print("💾 Saving to database...")
-            session_id = self.save_scrape_session(website_url, domain_name, stats)
+            # Save session metadata; it commits together with the pages
+            logger.info("💾 Saving to database...")
+            session_id = self.save_scrape_session(
+                website_url, domain_name, stats, commit=False
+            )
 
             if not session_id:
                 return False
 
             # Save pages with embeddings
-            success = self.save_scraped_pages(session_id, data)
+            success = self.save_scraped_pages(
+                session_id, data, batch_size, synchronous_commit=False
+            )
 
             return success
 
         finally:
             self.disconnect()
 
+    @staticmethod
+    def _quantize_int8(vectors: np.ndarray):
+        """
+        Symmetrically quantize each row to int8.
+
+        Args:
+            vectors: 2-D float array
+
+        Returns:
+            Tuple of (int8 matrix, float32 per-row scales) such that
+            ``vectors ~= matrix * scales[:, None]``
+        """
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+        return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
+    def _load_cache_matrix(self, cursor):
+        """
+        Load every page embedding into an int8-quantized, L2-normalized matrix.
+
+        Args:
+            cursor: Open database cursor
+
+        Returns:
+            Tuple of (page ids, int8 embedding matrix, per-row scales); the
+            matrix is None when the table holds more than
+            IN_MEMORY_SEARCH_MAX_ROWS embeddings
+        """
+        cursor.execute("""
+            SELECT count(*) FROM scraped_pages WHERE content_embedding IS NOT NULL
+        """)
+        if cursor.fetchone()[0] > IN_MEMORY_SEARCH_MAX_ROWS:
+            return None, None, None
+
+        cursor.execute("""
+            SELECT id, content_embedding::text FROM scraped_pages
+            WHERE content_embedding IS NOT NULL
+        """)
+        rows = cursor.fetchall()
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        if not rows:
+            return ids, np.empty((0, 0), dtype=np.int8), np.empty(0, dtype=np.float32)
+        # pgvector's text form (vector and halfvec alike) is "[x1,x2,...]"
+        matrix = np.array(
+            [row[1][1:-1].split(',') for row in rows], dtype=np.float32
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (ids, *self._quantize_int8(matrix / norms))
+
+    def _search_in_memory(
+        self,
+        cursor,
+        query_embedding: np.ndarray,
+        match_threshold: float,
+        match_count: int
+    ) -> Optional[List[Dict]]:
+        """
+        Shortlist pages with an int8 cosine scan, then score them exactly.
+
+        The quantized scan picks ``IN_MEMORY_SEARCH_OVERSAMPLE`` times more
+        candidates than needed; pgvector then computes exact similarities
+        for just those rows, so thresholds and scores match
+        search_similar_content(): pages above ``match_threshold``, best
+        first, at most ``match_count`` of them.
+
+        Args:
+            cursor: Open database cursor
+            query_embedding: Query vector
+            match_threshold: Minimum similarity score (0-1)
+            match_count: Maximum number of results
+
+        Returns:
+            List of matching pages with similarity scores, or None if the
+            corpus is too large and the SQL search should be used instead
+        """
+        state = self._cache_matrix_state
+        if state is None or time.monotonic() - state[0] > IN_MEMORY_SEARCH_TTL:
+            state = (time.monotonic(), *self._load_cache_matrix(cursor))
+            self._cache_matrix_state = state
+        _, ids, matrix, scales = state
+        if matrix is None:
+            return None
+
+        if match_count <= 0 or not len(ids):
+            return []
+        shortlist = min(match_count * IN_MEMORY_SEARCH_OVERSAMPLE, len(ids))
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if not np.any(query):
+            return []
+        query_q, _ = self._quantize_int8(query.reshape(1, -1))
+        if simsimd is not None:
+            # int8 SIMD cosine kernel (VNNI/NEON dot products)
+            scores = 1.0 - np.asarray(
+                simsimd.cdist(matrix, query_q, metric='cosine'),
+                dtype=np.float32
+            ).ravel()
+        else:
+            # Rows are unit-norm before quantization, so rescaling the int8
+            # dot product ranks by cosine similarity
+            scores = (matrix @ query_q[0].astype(np.int32)) * scales
+
+        top = np.argpartition(-scores, shortlist - 1)[:shortlist]
+        cursor.execute("""
+            SELECT id, url, title, page_type, content,
+                   1 - (content_embedding <=> %s::halfvec) AS similarity
+            FROM scraped_pages WHERE id = ANY(%s)
+        """, (query_embedding, ids[top].tolist()))
+
+        rows = sorted(cursor.fetchall(), key=lambda row: row[5], reverse=True)
+        results = []
+        for row in rows[:match_count]:
+            if row[5] <= match_threshold:
+                break
+            results.append({
+                'id': row[0],
+                'url': row[1],
+                'title': row[2],
+                'page_type': row[3],
+                'content': row[4],
+                'similarity': row[5]
+            })
+        return results
+
+    def _search_with_cursor(
+        self,
+        cursor,
+        query_embedding: np.ndarray,
+        match_threshold: float,
+        match_count: int,
+        in_memory: bool = False
+    ) -> List[Dict]:
+        """
+        Run one similarity search.
+
+        Args:
+            cursor: Open database cursor
+            query_embedding: Query vector
+            match_threshold: Minimum similarity score (0-1)
+            match_count: Maximum number of results
+            in_memory: Search the in-memory matrix when the corpus is small
+                enough (see search_similar)
+
+        Returns:
+            List of matching pages with similarity scores
+        """
+        if in_memory:
+            results = self._search_in_memory(
+                cursor, query_embedding, match_threshold, match_count
+            )
+            if results is not None:
+                return results
+
+        # Widen the HNSW beam for this transaction only
+        cursor.execute("SET LOCAL hnsw.ef_search = %s", (max(HNSW_EF_SEARCH, match_count),))
+        cursor.execute("""
+            SELECT * FROM search_similar_content(%s::halfvec, %s, %s)
+        """, (query_embedding, match_threshold, match_count))
+
+        results = []
+        for row in cursor.fetchall():
+            results.append({
+                'id': row[0],
+                'url': row[1],
+                'title': row[2],
+                'page_type': row[3],
+                'content': row[4],
+                'similarity': row[5]
+            })
+        return results
+
     def search_similar(
         self,
         query_text: str,
         match_threshold: float = 0.5,
-        match_count: int = 10
+        match_count: int = 10,
+        query_embedding: Optional[np.ndarray] = None,
+        in_memory: bool = False
     ) -> List[Dict]:
         """
         Search for pages similar to query text using vector similarity.
@@ -243,12 +710,17 @@ class DatabaseHandler:
             query_text: Text to search for
             match_threshold: Minimum similarity score (0-1)
             match_count: Maximum number of results
+            query_embedding: Precomputed embedding of ``query_text``
+            in_memory: Rank small corpora in memory (see _search_in_memory)
+                instead of with pgvector's search_similar_content(). The
+                first such search loads every embedding, so only long-lived
+                callers that search many times should set it
 
         Returns:
             List of matching pages with similarity scores
         """
         if not self.embedding_model:
-            print("❌ Embedding model not loaded, cannot search")
+            logger.error("❌ Embedding model not loaded, cannot search")
             return []
 
         if not self.connect():
@@ -256,36 +728,74 @@ class DatabaseHandler:
 
         try:
             # Generate embedding for query
-            query_embedding = self._generate_embedding(query_text)
-            if not query_embedding:
+            if query_embedding is None:
+                query_embedding = self._generate_embedding(query_text)
+            if query_embedding is None:
                 return []
 
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT * FROM search_similar_content(%s::vector, %s, %s)
-            """, (query_embedding, match_threshold, match_count))
-
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'id': row[0],
-                    'url': row[1],
-                    'title': row[2],
-                    'page_type': row[3],
-                    'content': row[4],
-                    'similarity': row[5]
-                })
-
+            results = self._search_with_cursor(
+                cursor, query_embedding, match_threshold, match_count, in_memory
+            )
             cursor.close()
             return results
 
         except Exception as e:
-            print(f"❌ Error searching similar content: {e}")
+            logger.error("❌ Error searching similar content: %s", e)
             return []
 
         finally:
             self.disconnect()
 
+    def search_similar_batch(
+        self,
+        queries: List[str],
+        match_threshold: float = 0.5,
+        match_count: int = 10,
+        in_memory: bool = False
+    ) -> List[List[Dict]]:
+        """
+        Search for pages similar to each of several queries.
+
+        All queries are embedded in one model call and searched over one
+        database connection.
+
+        Args:
+            queries: Texts to search for
+            match_threshold: Minimum similarity score (0-1)
+            match_count: Maximum number of results per query
+            in_memory: Rank small corpora in memory, as in search_similar
+
+        Returns:
+            One list of matching pages per query, in input order
+        """
+        if not self.embedding_model:
+            logger.error("❌ Embedding model not loaded, cannot search")
+            return [[] for _ in queries]
+
+        if not self.connect():
+            return [[] for _ in queries]
+
+        try:
+            embeddings = self._generate_embeddings(queries)
+            cursor = self.conn.cursor()
+            results = [
+                self._search_with_cursor(
+                    cursor, embedding, match_threshold, match_count, in_memory
+                )
+                if embedding is not None else []
+                for embedding in embeddings
+            ]
+            cursor.close()
+            return results
+
+        except Exception as e:
+            logger.error("❌ Error searching similar content: %s", e)
+            return [[] for _ in queries]
+
+        finally:
+            self.disconnect()
+
     def get_session_stats(self, session_id: Optional[int] = None) -> List[Dict]:
         """
         Get scraping session statistics.
@@ -300,7 +810,8 @@ class DatabaseHandler:
             return []
 
         try:
-            cursor = self.conn.cursor()
+            # Columns of scraping_statistics are the keys of each result
+            cursor = self.conn.cursor(cursor_factory=RealDictCursor)
 
             if session_id:
                 cursor.execute("""
@@ -312,26 +823,12 @@ class DatabaseHandler:
                     ORDER BY scraped_at DESC
                 """)
 
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'id': row[0],
-                    'website_url': row[1],
-                    'domain_name': row[2],
-                    'scraped_at': row[3],
-                    'pages_scraped': row[4],
-                    'total_words': row[5],
-                    'total_time_seconds': row[6],
-                    'actual_pages_count': row[7],
-                    'avg_word_count': row[8],
-                    'page_types_breakdown': row[9]
-                })
-
+            results = cursor.fetchall()
             cursor.close()
             return results
 
         except Exception as e:
-            print(f"❌ Error getting session stats: {e}")
+            logger.error("❌ Error getting session stats: %s", e)
             return []
 
         finally:
@@ -3,10 +3,53 @@
 """File handling utilities for saving scraped data."""
 import os
 import json
+import time
+from collections import ChainMap
 from typing import List, Dict
-from datetime import datetime
+from .singleton import SingletonMixin
 
-class FileHandler:
+try:
+    import orjson
+except ImportError:  # optional: fall back to stdlib json
+    orjson = None
+
+_RULE = '=' * 80
+_THIN_RULE = '-' * 80
+
+# Per-page sections of the text and Markdown reports; fields missing from
+# a page fall back to _PAGE_DEFAULTS
+_TEXT_PAGE_TEMPLATE = (
+    f"\n{_RULE}\n"
+    "Page {idx}: {page_type}\n"
+    f"{_RULE}\n\n"
+    "URL: {url}\n"
+    "Title: {title}\n"
+    "Description: {description}\n"
+    "Word Count: {word_count}\n"
+    f"\n{_THIN_RULE}\n"
+    "CONTENT:\n"
+    f"{_THIN_RULE}\n\n"
+    "{content}\n\n"
+)
+_MARKDOWN_PAGE_TEMPLATE = (
+    "## {idx}. {page_type}\n\n"
+    "**URL:** [{url}]({link})\n\n"
+    "**Title:** {title}  \n"
+    "**Description:** {description}  \n"
+    "**Word Count:** {word_count}\n\n"
+    "### Content\n\n"
+    "{content}\n\n---\n\n"
+)
+_PAGE_DEFAULTS = {
+    'page_type': 'Unknown',
+    'url': 'N/A',
+    'title': 'N/A',
+    'description': 'N/A',
+    'word_count': 'N/A',
+    'content': '',
+}
+
+class FileHandler(SingletonMixin):
     """Handle file operations for scraped data."""
     
     def __init__(self, output_dir: str = "scraped_data"):
@@ -16,8 +59,11 @@ class FileHandler:
         Args:
             output_dir: Directory to save scraped data
         """
+        if self._initialized:
+            return
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self._initialized = True
     
     def _get_website_folder(self, website_name: str) -> str:
         """
@@ -47,8 +93,12 @@ class FileHandler:
         folder_path = self._get_website_folder(filename)
         filepath = os.path.join(folder_path, f"{filename}.json")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
         return filepath
     
@@ -66,25 +116,20 @@ class FileHandler:
         folder_path = self._get_website_folder(filename)
         filepath = os.path.join(folder_path, f"{filename}.txt")
         
+        parts = [
+            "Scraped Data Report\n"
+            f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Total Pages: {len(data)}\n"
+            f"{_RULE}\n\n"
+        ]
+        parts.extend(
+            _TEXT_PAGE_TEMPLATE.format_map(ChainMap({'idx': idx}, item, _PAGE_DEFAULTS))
+            for idx, item in enumerate(data, 1)
+        )
+        
+        # Build the whole report first and write it in one call
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Scraped Data Report\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total Pages: {len(data)}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            for idx, item in enumerate(data, 1):
-                f.write(f"\n{'=' * 80}\n")
-                f.write(f"Page {idx}: {item.get('page_type', 'Unknown')}\n")
-                f.write(f"{'=' * 80}\n\n")
-                f.write(f"URL: {item.get('url', 'N/A')}\n")
-                f.write(f"Title: {item.get('title', 'N/A')}\n")
-                f.write(f"Description: {item.get('description', 'N/A')}\n")
-                f.write(f"Word Count: {item.get('word_count', 'N/A')}\n")
-                f.write(f"\n{'-' * 80}\n")
-                f.write("CONTENT:\n")
-                f.write(f"{'-' * 80}\n\n")
-                f.write(item.get('content', ''))
-                f.write("\n\n")
+            f.write(''.join(parts))
         
         return filepath
     
@@ -102,21 +147,22 @@ class FileHandler:
         folder_path = self._get_website_folder(filename)
         filepath = os.path.join(folder_path, f"{filename}.md")
         
+        parts = [
+            "# Scraped Data Report\n\n"
+            f"**Generated:** {time.strftime('%Y-%m-%d %H:%M:%S')}  \n"
+            f"**Total Pages:** {len(data)}\n\n"
+            "---\n\n"
+        ]
+        parts.extend(
+            _MARKDOWN_PAGE_TEMPLATE.format_map(
+                ChainMap({'idx': idx, 'link': item.get('url', '#')}, item, _PAGE_DEFAULTS)
+            )
+            for idx, item in enumerate(data, 1)
+        )
+        
+        # Build the whole report first and write it in one call
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"# Scraped Data Report\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  \n")
-            f.write(f"**Total Pages:** {len(data)}\n\n")
-            f.write("---\n\n")
-            
-            for idx, item in enumerate(data, 1):
-                f.write(f"## {idx}. {item.get('page_type', 'Unknown')}\n\n")
-                f.write(f"**URL:** [{item.get('url', 'N/A')}]({item.get('url', '#')})\n\n")
-                f.write(f"**Title:** {item.get('title', 'N/A')}  \n")
-                f.write(f"**Description:** {item.get('description', 'N/A')}  \n")
-                f.write(f"**Word Count:** {item.get('word_count', 'N/A')}\n\n")
-                f.write("### Content\n\n")
-                f.write(item.get('content', ''))
-                f.write("\n\n---\n\n")
+            f.write(''.join(parts))
         
         return filepath
     
@@ -0,0 +1,34 @@
+# utils/logging_utils.py
+
+"""Console logging shared by the command-line entry points."""
+import logging
+import sys
+from typing import Optional
+
+
+def console_handler() -> logging.Handler:
+    """
+    Create a handler printing bare messages to stdout, like print() did.
+
+    Returns:
+        logging.Handler: New stream handler
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def log_to_console(*names: str, handler: Optional[logging.Handler] = None) -> None:
+    """
+    Send INFO and above from the named loggers to one handler.
+
+    Args:
+        names: Logger names, e.g. a package such as 'utils' for all its modules
+        handler: Handler to attach; a new ``console_handler()`` if omitted
+    """
+    handler = handler or console_handler()
+    for name in names:
+        logger = logging.getLogger(name)
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
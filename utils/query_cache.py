@@ -0,0 +1,239 @@
+# utils/query_cache.py
+
+"""Process-wide caches of vector search results for repeated questions."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .singleton import SingletonMixin
+
+CacheKey = Tuple[str, float, int]
+
+
+class SemanticCache(SingletonMixin):
+    """
+    LRU + TTL cache keyed by normalized query text, threshold and k.
+
+    Each entry holds the unit-norm embedding of its query next to a
+    subclass-defined payload, so a lookup can hit either on the exact key
+    or on a cached query whose embedding has cosine similarity of at least
+    ``tau`` with the new one (same threshold and k). Any write to
+    scraped_pages should call ``clear()``.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached entries
+            ttl_seconds: Seconds before a cached entry expires
+        """
+        if self._initialized:
+            return
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        # key -> (unit-norm embedding or None, payload, expires_at)
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._initialized = True
+
+    @staticmethod
+    def make_key(query: str, threshold: float, k: int) -> CacheKey:
+        """
+        Build the exact-match key for a query.
+
+        Args:
+            query: Query text
+            threshold: Similarity threshold used for the search
+            k: Maximum number of results
+
+        Returns:
+            Tuple of (normalized query, threshold, k)
+        """
+        return (' '.join(query.lower().split()), float(threshold), int(k))
+
+    @staticmethod
+    def _normalize(embedding: Optional[Sequence[float]]):
+        if embedding is None:
+            return None
+        import numpy as np
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _drop_expired(self, now: float) -> None:
+        expired = [key for key, (_, _, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _lookup_exact(self, key: CacheKey) -> Optional[Any]:
+        """
+        Look up the payload cached under exactly this key.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= time.time():
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _lookup_semantic(
+        self,
+        embedding: Optional[Sequence[float]],
+        threshold: float,
+        k: int,
+        tau: float
+    ) -> Optional[Tuple[CacheKey, Any]]:
+        """
+        Look up the entry of the closest cached query.
+
+        Args:
+            embedding: Embedding of the incoming query
+            threshold: Similarity threshold used for the search
+            k: Maximum number of results
+            tau: Minimum cosine similarity between the two queries
+
+        Returns:
+            Tuple of (cached key, payload), or None on a miss
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            self.misses += 1
+            return None
+
+        import numpy as np
+
+        with self._lock:
+            self._drop_expired(time.time())
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry[0] is not None and key[1] == float(threshold) and key[2] == int(k)
+            ]
+            if not candidates:
+                self.misses += 1
+                return None
+
+            matrix = np.stack([entry[0] for _, entry in candidates])
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < tau:
+                self.misses += 1
+                return None
+
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return key, entry[1]
+
+    def _store(self, key: CacheKey, vector: Any, payload: Any) -> None:
+        """
+        Cache a payload, evicting the least recently used entries.
+
+        Args:
+            key: Key from ``make_key``
+            vector: Unit-norm query embedding from ``_normalize``, or None
+            payload: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (vector, payload, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries (call after the indexed data changes)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with size, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class QueryCache(SemanticCache):
+    """
+    LRU + TTL cache of similarity search results.
+
+    Lookups first try an exact match on the normalized query text, then a
+    semantic match (see SemanticCache).
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 300):
+        """
+        Initialize query cache.
+
+        Args:
+            max_size: Maximum number of cached queries
+            ttl_seconds: Seconds before a cached result expires
+        """
+        super().__init__(max_size, ttl_seconds)
+
+    def get_exact(self, key: CacheKey) -> Optional[List[Dict]]:
+        """
+        Look up results cached for exactly this query.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        return self._lookup_exact(key)
+
+    def get_semantic(
+        self,
+        embedding: Optional[Sequence[float]],
+        threshold: float,
+        k: int,
+        tau: float = 0.97
+    ) -> Optional[List[Dict]]:
+        """
+        Look up results cached for a near-duplicate query.
+
+        Args:
+            embedding: Embedding of the incoming query
+            threshold: Similarity threshold used for the search
+            k: Maximum number of results
+            tau: Minimum cosine similarity between the two queries
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        hit = self._lookup_semantic(embedding, threshold, k, tau)
+        return hit[1] if hit else None
+
+    def put(self, key: CacheKey, embedding: Optional[Sequence[float]], results: List[Dict]) -> None:
+        """
+        Cache search results for a query.
+
+        Args:
+            key: Key from ``make_key``
+            embedding: Embedding of the query, enables semantic hits
+            results: Search results to cache
+        """
+        self._store(key, self._normalize(embedding), results)
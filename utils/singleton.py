@@ -0,0 +1,40 @@
+# utils/singleton.py
+
+"""Singleton mixin for components that are expensive to construct."""
+import threading
+from typing import Any, Dict, Tuple
+
+
+class SingletonMixin:
+    """
+    Cache one instance per class and constructor arguments.
+
+    Calling the class again with the same arguments returns the cached
+    instance, so heavy setup (embedding model load, browser config, output
+    directories) happens once per process. Subclasses should start their
+    ``__init__`` with ``if self._initialized: return`` and set
+    ``self._initialized = True`` once setup is done.
+    """
+
+    _instances: Dict[Tuple, Any] = {}
+    _instances_lock = threading.Lock()
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        key = (cls, args, tuple(sorted(kwargs.items())))
+        instance = SingletonMixin._instances.get(key)
+        if instance is None:
+            with SingletonMixin._instances_lock:
+                instance = SingletonMixin._instances.get(key)
+                if instance is None:
+                    instance = super().__new__(cls)
+                    SingletonMixin._instances[key] = instance
+        return instance
+
+    @classmethod
+    def clear_instances(cls) -> None:
+        """Drop cached instances of this class (all classes when called on the mixin)."""
+        with SingletonMixin._instances_lock:
+            for key in list(SingletonMixin._instances):
+                if cls is SingletonMixin or issubclass(key[0], cls):
+                    del SingletonMixin._instances[key]
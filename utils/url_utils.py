@@ -1,18 +1,32 @@
 # utils/url_utils.py
 
 """URL utility functions."""
-from urllib.parse import urlparse
+import re
+from typing import Optional
+from urllib.parse import urlparse, ParseResult
+
+# Second-level labels of country-code suffixes such as co.uk, com.au, edu.au
+_CCTLD_SECOND_LEVEL = frozenset({'co', 'com', 'org', 'gov', 'ac', 'net', 'edu'})
+
+# Characters urlparse strips from the start of a URL (C0 controls and space)
+_LEADING_JUNK = ''.join(map(chr, range(0x21)))
+# Characters urlparse removes anywhere in a URL
+_EMBEDDED_JUNK = str.maketrans('', '', '\t\r\n')
+
+# scheme, netloc, path and query of an http(s) URL; the fragment is left out
+_HTTP_URL = re.compile(r'(https?)://([^/?#]*)([^?#]*)(?:\?([^#]*))?', re.IGNORECASE)
 
 class URLUtils:
     """Utility functions for URL manipulation."""
     
     @staticmethod
-    def get_domain_name(url: str) -> str:
+    def get_domain_name(url: str, parsed: Optional[ParseResult] = None) -> str:
         """
         Extract clean domain name from URL.
         
         Args:
             url: Full URL
+            parsed: Already-parsed ``url``, to skip re-parsing it
             
         Returns:
             str: Clean domain name
@@ -21,7 +35,8 @@ class URLUtils:
             https://www.example.com/page -> example
             https://subdomain.example.com -> example
         """
-        parsed = urlparse(url)
+        if parsed is None:
+            parsed = urlparse(url)
         domain = parsed.netloc
         
         # Remove www. if present
@@ -32,50 +47,58 @@ class URLUtils:
         parts = domain.split('.')
         if len(parts) > 1:
             # Handle cases like co.uk, com.au
-            if parts[-2] in ['co', 'com', 'org', 'gov', 'ac']:
+            if parts[-2] in _CCTLD_SECOND_LEVEL:
                 return parts[-3] if len(parts) > 2 else parts[0]
             return parts[-2]
         
         return parts[0]
     
     @staticmethod
-    def is_valid_url(url: str) -> bool:
+    def is_valid_url(url: str, parsed: Optional[ParseResult] = None) -> bool:
         """
         Check if URL is valid.
         
         Args:
             url: URL to validate
+            parsed: Already-parsed ``url``, to skip re-parsing it
             
         Returns:
             bool: True if valid, False otherwise
         """
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except:
-            return False
+        if parsed is None:
+            try:
+                parsed = urlparse(url)
+            except ValueError:
+                return False
+        return bool(parsed.scheme and parsed.netloc)
     
     @staticmethod
     def normalize_url(url: str) -> str:
         """
         Normalize URL (remove trailing slash, fragments, etc.).
         
+        Leading control characters and spaces, and tabs or newlines
+        anywhere, are removed first, as urlparse does.
+        
         Args:
             url: URL to normalize
             
         Returns:
-            str: Normalized URL
+            str: Normalized URL (non-http(s) URLs are returned unchanged)
         """
-        parsed = urlparse(url)
+        url = url.lstrip(_LEADING_JUNK).translate(_EMBEDDED_JUNK)
+        match = _HTTP_URL.match(url)
+        if not match:
+            return url
+        scheme, netloc, path, query = match.groups()
         
         # Rebuild URL without fragment
-        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-        
-        if parsed.query:
-            normalized += f"?{parsed.query}"
+        normalized = f"{scheme.lower()}://{netloc}{path}"
         
+        if query:
+            normalized += f"?{query}"
         # Remove trailing slash
-        if normalized.endswith('/') and parsed.path != '/':
+        elif path.endswith('/') and path != '/':
             normalized = normalized[:-1]
         
         return normalized
\ No newline at end of file